@@ -5,3 +5,5 @@ from .admin_route import admin_dashboard_api
 from .appointment_route import appointment_api_route
 from .availability_route import availability_api
 from .treatment_route import treatment_api_route
+from .export_route import export_api_route
+from .metrics_route import metrics_api_route
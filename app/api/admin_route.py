@@ -1,10 +1,17 @@
+from typing import Optional
+
 from fastapi import (
     APIRouter,
     Depends,
+    Query,
     status
 )
  
+from ..core.config import settings
+from ..core.cache import cache
+from ..core.security import password_hash_metrics
 from ..service import AdminService
+from ..database.session import read_only
 from ..database.api_models.admin_model import DashboardSearchResponse
 
 
@@ -17,7 +24,25 @@ admin_dashboard_api = APIRouter(prefix="/admin/dashboard", tags=["Admin"])
 )
 async def query(
     query_string: str,
-    service: AdminService = Depends(AdminService)
+    limit: int = Query(settings.SEARCH_RESULTS_PER_CATEGORY, ge=1, le=settings.PAGE_SIZE_MAX),
+    timeout_ms: Optional[int] = Query(None, ge=1),
+    service: AdminService = Depends(read_only(AdminService))
 ):
-    return await service.query_(query_string=query_string)
+    timeout = timeout_ms / 1000 if timeout_ms else None
+    return await service.query_(query_string=query_string, limit=limit, timeout=timeout)
+
+
+@admin_dashboard_api.get(
+    "/stats/password-hashing",
+    status_code=status.HTTP_200_OK
+)
+async def password_hashing_stats():
+    return password_hash_metrics()
+
 
+@admin_dashboard_api.get(
+    "/stats/cache",
+    status_code=status.HTTP_200_OK
+)
+async def cache_stats():
+    return cache.stats()
@@ -1,15 +1,25 @@
+from typing import Optional
+
 from fastapi import (
     APIRouter,
     Depends,
-    status
+    Query,
+    status,
+    Response
 )
 
 from ..database.api_models.appointment_treatment_model import (
     AppointmentCreate,
-    AppointmentResponse
+    AppointmentResponse,
+    AppointmentBulkCreate,
+    AppointmentBulkResponse
 )
+from ..database.api_models.pagination_model import Page
+from ..core.config import settings
+from ..core.responses import trusted_response
 
 from ..service import AppointmentService
+from ..database.session import read_only
 
 
 appointment_api_route = APIRouter(prefix="/appointment", tags=["Appointment"])
@@ -18,12 +28,17 @@ appointment_api_route = APIRouter(prefix="/appointment", tags=["Appointment"])
 @appointment_api_route.get(
     "/get/all",
     status_code=status.HTTP_200_OK,
-    response_model=list[AppointmentResponse]
+    response_model=Page[AppointmentResponse]
 )
 async def get_appointments(
-    service: AppointmentService = Depends(AppointmentService)
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    after: Optional[str] = None,
+    include_total: bool = False,
+    service: AppointmentService = Depends(read_only(AppointmentService))
 ):
-    return await service.get_all_appointment()
+    page = await service.get_all_appointment(limit=limit, after=after, include_total=include_total)
+    return trusted_response(page, Page[AppointmentResponse], response)
 
 
 @appointment_api_route.get(
@@ -33,7 +48,7 @@ async def get_appointments(
 )
 async def get_appointment_by_appointment_id(
     appointment_id: str, 
-    service: AppointmentService = Depends(AppointmentService)
+    service: AppointmentService = Depends(read_only(AppointmentService))
 ):
     return await service.get_appointment_by_appointment_id_(appointment_id=appointment_id)
 
@@ -46,7 +61,7 @@ async def get_appointment_by_appointment_id(
 async def get_appointment_by_patient_and_doctor_id(
     doctor_id: str, 
     patient_id: str, 
-    service: AppointmentService = Depends(AppointmentService)
+    service: AppointmentService = Depends(read_only(AppointmentService))
 ):
     return await service.get_appointment_with_patient_and_doctor_(doctor_id=doctor_id, patient_id=patient_id)
 
@@ -85,6 +100,18 @@ async def create_appointment(
     return await service.create_appointment_(payload=payload)
 
 
+@appointment_api_route.post(
+    "/create/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=AppointmentBulkResponse
+)
+async def create_appointments_bulk(
+    payload: AppointmentBulkCreate,
+    service: AppointmentService = Depends(AppointmentService)
+):
+    return await service.create_appointments_bulk_(payload=payload)
+
+
 @appointment_api_route.put(
     "/complete/{patient_id}/{doctor_id}/{date}/{shift}",
     status_code=status.HTTP_200_OK
@@ -5,9 +5,13 @@ from fastapi import (
 )
 
 from ..service import DoctorAvailabilityService 
+from ..database.session import read_only
+from .etag import conditional_get
 from ..database.api_models.doctor_availability_model import (
     DoctorAvailabilityUpdate,
-    DoctorAvailabilityResponse
+    DoctorAvailabilityResponse,
+    DoctorAvailabilityBulkUpdate,
+    DoctorAvailabilityBulkResponse
 )
 
 from datetime import date
@@ -19,17 +23,18 @@ availability_api = APIRouter(prefix="/doctor/availability", tags=["Doctor Availa
 @availability_api.get(
     "/get/{doctor_id}",
     status_code=status.HTTP_200_OK,
-    response_model=dict[str,list[DoctorAvailabilityResponse]]
+    response_model=dict[str,list[DoctorAvailabilityResponse]],
+    dependencies=[Depends(conditional_get("doctor_availability"))]
 )
 async def get_availability(
     doctor_id: str,
-    service: DoctorAvailabilityService = Depends(DoctorAvailabilityService)
+    service: DoctorAvailabilityService = Depends(read_only(DoctorAvailabilityService))
 ):
     return await service.get_availabilites(doctor_id=doctor_id)
 
 
 @availability_api.post(
-    "create/{doctor_id}",
+    "/create/{doctor_id}",
     status_code=status.HTTP_201_CREATED,
 )
 async def create_availabilitys(
@@ -39,6 +44,18 @@ async def create_availabilitys(
     return await service.create_availability_for_week(doctor_id=doctor_id)
 
 
+@availability_api.put(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=DoctorAvailabilityBulkResponse
+)
+async def update_availability_bulk(
+    payload: DoctorAvailabilityBulkUpdate,
+    service: DoctorAvailabilityService = Depends(DoctorAvailabilityService)
+):
+    return await service.update_availability_bulk(payload=payload)
+
+
 @availability_api.put( 
     "/{doctor_id}/{date}",
     status_code=status.HTTP_200_OK
@@ -1,7 +1,11 @@
+from typing import Optional
+
 from fastapi import (
     APIRouter,
     Depends,
-    status
+    Query,
+    status,
+    Response
 )
 
 from ..database.api_models.department_model import (
@@ -9,7 +13,12 @@ from ..database.api_models.department_model import (
     DepartmentResponse,
     DepatemtntUpdate
 )
+from ..database.api_models.pagination_model import Page
+from ..core.config import settings
+from ..core.responses import trusted_response
 from ..service import DepartmentService
+from ..database.session import read_only
+from .etag import conditional_get
 
 admin_department_api_route = APIRouter(prefix="/admin/department", tags=["Department"])
 
@@ -28,12 +37,18 @@ async def create_department(
 @admin_department_api_route.get(
     "/get/all",
     status_code=status.HTTP_200_OK,
-    response_model=list[DepartmentResponse]
+    response_model=Page[DepartmentResponse],
+    dependencies=[Depends(conditional_get("department"))]
 )
 async def get_all_department(
-    service: DepartmentService = Depends(DepartmentService)
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    after: Optional[str] = None,
+    include_total: bool = False,
+    service: DepartmentService = Depends(read_only(DepartmentService))
 ):
-    return await service.get_all_department_()
+    page = await service.get_all_department_(limit=limit, after=after, include_total=include_total)
+    return trusted_response(page, Page[DepartmentResponse], response)
 
 
 @admin_department_api_route.get(
@@ -43,7 +58,7 @@ async def get_all_department(
 )
 async def get_department(
     department_id, 
-    service: DepartmentService = Depends(DepartmentService)
+    service: DepartmentService = Depends(read_only(DepartmentService))
 ):
     return await service.get_department(department_id=department_id)
 
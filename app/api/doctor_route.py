@@ -1,15 +1,24 @@
+from typing import Optional
+
 from fastapi import (
     APIRouter, 
     Depends,
-    status
+    Query,
+    status,
+    Response
 )
 from ..database.api_models.doctor_model import (
     DoctorCreate,
     DoctorSummary,
     DoctorUpdate,
 )
+from ..database.api_models.pagination_model import Page
+from ..core.config import settings
+from ..core.responses import trusted_response
 from ..service import DoctorAvailabilityService
 from ..service.doctor_service import DoctorService
+from ..database.session import read_only
+from .etag import conditional_get
 
 admin_doctor_api_route = APIRouter(prefix="/admin/doctor", tags=["Doctor"])
 
@@ -17,22 +26,29 @@ admin_doctor_api_route = APIRouter(prefix="/admin/doctor", tags=["Doctor"])
 @admin_doctor_api_route.get(
     "/get/all",
     status_code=status.HTTP_200_OK,
-    response_model=list[DoctorSummary]
+    response_model=Page[DoctorSummary],
+    dependencies=[Depends(conditional_get("doctor", "department"))]
 )
 async def get_doctors(
-    service: DoctorService = Depends(DoctorService)
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    after: Optional[str] = None,
+    include_total: bool = False,
+    service: DoctorService = Depends(read_only(DoctorService))
 ):
-    return await service.get_all_doctors_()
+    page = await service.get_all_doctors_(limit=limit, after=after, include_total=include_total)
+    return trusted_response(page, Page[DoctorSummary], response)
 
 
 @admin_doctor_api_route.get(
     "/get/{doctor_id}", 
     status_code=status.HTTP_200_OK,
-    response_model=DoctorSummary
+    response_model=DoctorSummary,
+    dependencies=[Depends(conditional_get("doctor", "department"))]
 )
 async def get_doctor(
     doctor_id: str,
-    service: DoctorService = Depends(DoctorService)
+    service: DoctorService = Depends(read_only(DoctorService))
 ):
     return await service.get_doctor_(doctor_id=doctor_id)
 
@@ -0,0 +1,61 @@
+"""
+Conditional GETs for polled endpoints.
+
+`conditional_get(*tables)` is a route dependency. It builds a strong ETag from
+the change versions of `tables` (see `app.service.table_version`) plus the
+path and query string, and answers `304 Not Modified` before the route runs
+when the client's `If-None-Match` matches. Otherwise the ETag is set on the
+response.
+"""
+import hashlib
+
+from fastapi import (
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database.session import get_read_db
+from ..service.table_version import get_table_versions
+
+
+def make_etag(request: Request, versions: dict[str, int]) -> str:
+    parts = [request.url.path, str(request.query_params)]
+    parts.extend(f"{table}={version}" for table, version in sorted(versions.items()))
+    digest = hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    # If-None-Match uses the weak comparison
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_get(*tables: str):
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_read_db)
+    ):
+        versions = await get_table_versions(db, tables)
+        etag = make_etag(request, versions)
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag}
+            )
+
+        response.headers["ETag"] = etag
+
+    return dependency
@@ -0,0 +1,35 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    status
+)
+from fastapi.responses import StreamingResponse
+
+from ..database.api_models.export_model import (
+    ExportFormat,
+    ExportTable
+)
+from ..service import ExportService
+
+
+export_api_route = APIRouter(prefix="/export", tags=["Export"])
+
+
+@export_api_route.get(
+    "/{table}",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse
+)
+async def export_table(
+    table: ExportTable,
+    format: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = False,
+    service: ExportService = Depends(ExportService)
+):
+    return StreamingResponse(
+        service.stream_(table=table, export_format=format, compress=gzip),
+        media_type=service.media_type(export_format=format, compress=gzip),
+        headers={
+            "Content-Disposition": f'attachment; filename="{service.filename(table, format, gzip)}"'
+        }
+    )
@@ -0,0 +1,19 @@
+from fastapi import (
+    APIRouter,
+    status
+)
+from fastapi.responses import PlainTextResponse
+
+from ..core.metrics import CONTENT_TYPE, render_metrics
+
+
+metrics_api_route = APIRouter(tags=["Metrics"])
+
+
+@metrics_api_route.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse
+)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
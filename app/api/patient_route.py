@@ -1,14 +1,22 @@
+from typing import Optional
+
 from fastapi import (
     APIRouter, 
     Depends,
-    status
+    Query,
+    status,
+    Response
 )
 from ..database.api_models.patient_model import (
     PateintCreate,
     PateintUpdate,
     PatientSummary
 )
+from ..database.api_models.pagination_model import Page
+from ..core.config import settings
+from ..core.responses import trusted_response
 from ..service import PatientService
+from ..database.session import read_only
 
 patient_api_route = APIRouter(prefix="/patient", tags=["Patient"])
 
@@ -16,12 +24,17 @@ patient_api_route = APIRouter(prefix="/patient", tags=["Patient"])
 @patient_api_route.get(
     "/get/all",
     status_code=status.HTTP_200_OK,
-    response_model=list[PatientSummary]
+    response_model=Page[PatientSummary]
 )
 async def get_patients(
-    service: PatientService = Depends(PatientService)
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    after: Optional[str] = None,
+    include_total: bool = False,
+    service: PatientService = Depends(read_only(PatientService))
 ):
-    return await service.get_all_patient_()
+    page = await service.get_all_patient_(limit=limit, after=after, include_total=include_total)
+    return trusted_response(page, Page[PatientSummary], response)
 
 
 @patient_api_route.get(
@@ -31,7 +44,7 @@ async def get_patients(
 )
 async def get_doctor(
     patient_id: str,
-    service: PatientService = Depends(PatientService)
+    service: PatientService = Depends(read_only(PatientService))
 ):
     return await service.get_patient_(patient_id=patient_id)
 
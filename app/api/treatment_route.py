@@ -1,28 +1,40 @@
+from typing import Optional
+
 from fastapi import (
     APIRouter,
     Depends,
-    status
+    Query,
+    status,
+    Response
 )
 
 from ..database.api_models.appointment_treatment_model import (
-    PatientHistoryData,
+    PatientHistoryResponse,
     TreatmentCreate
 )
+from ..database.api_models.pagination_model import Page
+from ..core.config import settings
+from ..core.responses import trusted_response
 
 from ..service import TreatmentService
+from ..database.session import read_only
 
 treatment_api_route = APIRouter(prefix="/treatment", tags=["Treatment"])
 
 @treatment_api_route.get(
     "/history/{patient_id}",
     status_code=status.HTTP_200_OK,
-    response_model=PatientHistoryData
+    response_model=Page[PatientHistoryResponse]
 )
 async def get_patient_history(
     patient_id: str,
-    service: TreatmentService = Depends(TreatmentService)
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    after: Optional[str] = None,
+    service: TreatmentService = Depends(read_only(TreatmentService))
 ):
-    return await service.get_patient_history_(patient_id=patient_id)
+    page = await service.get_patient_history_(patient_id=patient_id, limit=limit, after=after)
+    return trusted_response(page, Page[PatientHistoryResponse], response)
 
 
 @treatment_api_route.post(
@@ -33,4 +45,4 @@ async def create_treatment(
     payload: TreatmentCreate,
     service: TreatmentService = Depends(TreatmentService)
 ):
-    return service.create_new_treatment_(payload=payload)
+    return await service.create_new_treatment_(payload=payload)
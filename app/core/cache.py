@@ -0,0 +1,187 @@
+"""
+In-process read-through cache for reference data (doctors, departments).
+
+Entries live in namespaces. Writers call `cache.invalidate(namespace)` after
+their commit. Invalidation bumps the namespace generation instead of
+scanning the keys, so stale entries are never read again and age out of the
+LRU. A load that started before an invalidation is stored under the old
+generation and is therefore never served.
+
+Per-entity data (e.g. one patient's history) passes a `scope` and is
+invalidated with `cache.invalidate_scope(namespace, scope)`, which bumps a
+generation of that scope only, the rest of the namespace stays cached.
+
+The default backend is a per-process TTL + LRU map. With several workers
+every process has its own copy and only sees its own invalidations, plug a
+shared backend in with `cache.set_backend` if that matters.
+"""
+import functools
+import time
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from .config import settings
+
+
+_MISSING = object()
+
+
+class CacheBackend(ABC):
+    """Storage interface, `get` returns `_MISSING` for absent or expired keys."""
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any:
+        ...
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: float):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    """TTL + LRU map bounded to `max_entries`."""
+
+    def __init__(self, max_entries: int = settings.CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (expires at, value), least recently used first
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class Cache:
+    def __init__(self, backend: CacheBackend, ttl: float = settings.CACHE_TTL_SECONDS, enabled: bool = settings.CACHE_ENABLED):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._generations: dict[str, int] = {}
+        # namespace -> {scope: generation}, dropped with the namespace generation
+        self._scope_generations: dict[str, dict[Hashable, int]] = {}
+        # namespace -> {"hits", "misses", "invalidations"}
+        self._counters: dict[str, dict[str, int]] = {}
+
+    def set_backend(self, backend: CacheBackend):
+        self.backend = backend
+        self._generations.clear()
+        self._scope_generations.clear()
+
+    def _count(self, namespace: str, counter: str):
+        counters = self._counters.setdefault(namespace, {"hits": 0, "misses": 0, "invalidations": 0})
+        counters[counter] += 1
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        scope: Hashable = None
+    ) -> Any:
+        if not self.enabled:
+            return await loader()
+
+        generation = self._generations.get(namespace, 0)
+        scope_generation = self._scope_generations.get(namespace, {}).get(scope, 0)
+        full_key = (namespace, generation, scope, scope_generation, key)
+
+        value = self.backend.get(full_key)
+        if value is not _MISSING:
+            self._count(namespace, "hits")
+            return value
+
+        self._count(namespace, "misses")
+        value = await loader()
+        self.backend.set(full_key, value, self.ttl)
+        return value
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            # entries of older scope generations are unreachable now as well
+            self._scope_generations.pop(namespace, None)
+            self._count(namespace, "invalidations")
+
+    def invalidate_scope(self, namespace: str, *scopes: Hashable):
+        generations = self._scope_generations.setdefault(namespace, {})
+        for scope in scopes:
+            generations[scope] = generations.get(scope, 0) + 1
+            self._count(namespace, "invalidations")
+
+    def stats(self) -> dict:
+        totals = {"hits": 0, "misses": 0, "invalidations": 0}
+        for counters in self._counters.values():
+            for name, value in counters.items():
+                totals[name] += value
+
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "max_entries": getattr(self.backend, "max_entries", None),
+            "ttl_seconds": self.ttl,
+            **totals,
+            "hit_ratio": totals["hits"] / lookups if lookups else 0.0,
+            "evictions": getattr(self.backend, "evictions", 0),
+            "expirations": getattr(self.backend, "expirations", 0),
+            "namespaces": {name: dict(counters) for name, counters in self._counters.items()},
+        }
+
+
+cache = Cache(MemoryBackend())
+
+
+def cached(namespace: str):
+    """
+    Cache the result of an async service method under `namespace`, keyed on
+    the method name and its arguments (without `self`). Exceptions such as
+    a 404 are not cached.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            return await cache.get_or_load(
+                namespace,
+                key,
+                lambda: method(self, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
@@ -16,6 +16,10 @@ if not DB_FILE.exists():
 class Settings(BaseSettings):
     DEBUG: bool = False 
 
+    # skip schema reflection when the database is already at the latest
+    # migration, bootstrap the admin and scheduler off the startup path
+    FAST_BOOT: bool = False
+
     SQLALCHEMY_SYNC_DATABASE_URI: str = (
         f"sqlite:///{DB_FILE.as_posix()}"
     )
@@ -24,13 +28,90 @@ class Settings(BaseSettings):
         f"sqlite+aiosqlite:///{DB_FILE.as_posix()}"
     )
 
+    # read-only engine of the GET routes, derived from the async URI (mode=ro)
+    # when unset. Separate pools: SQLite has a single writer, WAL readers
+    # run concurrently and should not queue behind bookings.
+    SQLALCHEMY_READ_DATABASE_URI: Optional[str] = None
+    DB_WRITE_POOL_SIZE: int = 3
+    DB_WRITE_MAX_OVERFLOW: int = 2
+    DB_READ_POOL_SIZE: int = 10
+    DB_READ_MAX_OVERFLOW: int = 10
+
     API_BASE: Optional[str] = None
     API_SERVER_URL: Optional[str] = None
 
+    # "default" keeps SQLite's stock settings, "production" applies the
+    # SQLITE_* pragmas below to every pooled connection of both engines.
+    DB_PROFILE: str = "default"
+    DB_ECHO: bool = False               # full statement echo, see SQL_LOG_* for sampling
+
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000        # negative value = KiB, i.e. ~64MB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT: int = 5000        # milliseconds
+    SQLITE_FOREIGN_KEYS: bool = True
+
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+    # validate trusted list responses against their model (slow, for development)
+    RESPONSE_VALIDATION: bool = False
+    PAGE_TOTAL_CACHE_SECONDS: int = 60
+
+    EXPORT_CHUNK_ROWS: int = 2000
+
+    # read-through cache for doctors and departments
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: float = 300
+    CACHE_MAX_ENTRIES: int = 1024
+
+    SEARCH_RESULTS_PER_CATEGORY: int = 20
+    SEARCH_CONCURRENCY: int = 4            # category searches in flight per request
+
+    # bookable appointments per doctor, day and shift
+    SHIFT_CAPACITY: int = 20
+    # weeks of doctor availability kept materialized ahead, from the current Monday
+    AVAILABILITY_HORIZON_WEEKS: int = 4
+    BULK_MAX_ITEMS: int = 1000
+
+    PASSWORD_HASH_EXECUTOR: str = "thread"     # "thread" | "process"
+    PASSWORD_HASH_WORKERS: int = 4
+
     SCHEDULER_API_ENABLED: bool = True 
+    # with several workers only the holder of the lease row runs the jobs,
+    # it renews it every heartbeat, another worker takes over once it expires
+    SCHEDULER_LEADER_ELECTION: bool = True
+    SCHEDULER_LEASE_SECONDS: float = 30
+    SCHEDULER_HEARTBEAT_SECONDS: float = 10
+    # how far back a new leader looks for missed job runs
+    SCHEDULER_CATCHUP_HOURS: float = 24
+    # appointments marked "Missed" per transaction by the nightly sweep
+    SWEEP_BATCH_SIZE: int = 500
 
     LOG_FILE: str = "debug.log"
     LOG_FORMAT: str = "%(asctime)s %(levelname)s %(name)s %(threadName)s : %(message)s"
+    LOG_JSON: bool = True
+    # per-logger levels, e.g. LOG_LEVELS='{"sqlalchemy.engine": "WARNING"}'
+    LOG_LEVELS: dict[str, str] = {}
+
+    # SQL statement logging: 1 in N statements (0 = off) and/or every
+    # statement slower than SQL_LOG_SLOW_MS
+    SQL_LOG_SAMPLE_RATE: int = 0
+    SQL_LOG_SLOW_MS: Optional[float] = None
+    SQL_LOG_PARAMS: bool = False
+
+    # /metrics, per route / statement shape / scheduler job
+    METRICS_ENABLED: bool = True
+    # shared directory for merging the metrics of several gunicorn workers
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_SECONDS: float = 5
+
+    # debug / CI: per-request SQL statement count and DB time (X-Query-Count,
+    # X-DB-Time headers), a warning when one statement repeats N times (N+1)
+    QUERY_STATS_ENABLED: bool = False
+    QUERY_STATS_N1_THRESHOLD: int = 5
+    RAISE_ON_LAZY_LOAD: bool = False
 
     class Config:
         env_file = ".env"
@@ -78,3 +159,17 @@ try:
     )
 except Exception:
     pass
+
+
+def _read_only_uri(uri: str | None) -> str | None:
+    """The same SQLite file opened as a read-only URI filename."""
+    if not uri or not uri.startswith("sqlite") or ':///' not in uri:
+        return uri
+
+    prefix, _sep, db_path = uri.partition(':///')
+    if db_path.startswith("file:") or db_path in ("", ":memory:"):
+        return uri
+    return f"{prefix}:///file:{db_path}?mode=ro&uri=true"
+
+if not settings.SQLALCHEMY_READ_DATABASE_URI:
+    settings.SQLALCHEMY_READ_DATABASE_URI = _read_only_uri(settings.SQLALCHEMY_ASYNC_DATABASE_URI)
@@ -0,0 +1,78 @@
+"""
+Non-blocking logging pipeline.
+
+Every logger writes into an in-memory queue through a `QueueHandler`, a
+`QueueListener` thread drains it into the log file. The request path only
+pays for an enqueue, never for file I/O.
+"""
+import atexit
+import datetime
+import json
+import logging
+import queue
+
+from logging.handlers import QueueHandler, QueueListener
+
+from .config import settings
+
+
+# attributes every LogRecord has, anything else was passed through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, `extra=` fields are included as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+def setup_logging() -> QueueListener:
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    file_handler = logging.FileHandler(settings.LOG_FILE)
+    file_handler.setFormatter(
+        JsonFormatter() if settings.LOG_JSON else logging.Formatter(settings.LOG_FORMAT)
+    )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    return _listener
+
+
+def shutdown_logging():
+    """Flush the queue and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
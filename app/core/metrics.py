@@ -0,0 +1,353 @@
+"""
+Process metrics in the Prometheus text exposition format.
+
+A small self-contained registry (counters, gauges, histograms with labels),
+so no client library is needed. Everything is recorded in-process:
+
+* `MetricsMiddleware`  - per-route latency, status codes and in-flight requests
+* `app.database.sql_metrics` - per-statement-shape timings and row counts
+* `observe_pool_checkout` - time spent waiting for a pooled connection
+* `timed_job` - scheduler job durations and outcomes
+
+With several gunicorn workers set `METRICS_MULTIPROC_DIR` to a directory
+shared by the workers (empty it before starting the server). Every worker
+writes a snapshot there every METRICS_FLUSH_SECONDS and on shutdown, and
+`/metrics` merges all snapshots: counters and histograms are summed over
+every worker that ever ran, gauges only over the workers still alive.
+"""
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+
+from typing import Iterable
+
+from .config import settings
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts (not cumulative), sum, count]
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), [list(state[0]), state[1], state[2]]] for key, state in self._values.items()]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> dict:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def render(self, snapshots: list[dict]) -> str:
+        """Prometheus text for the merge of `snapshots` (one per process)."""
+        lines = []
+        for name, metric in self._metrics.items():
+            merged: dict[tuple, object] = {}
+            for snapshot in snapshots:
+                for key, value in snapshot.get(name, []):
+                    key = tuple(key)
+                    if metric.kind == "histogram":
+                        state = merged.setdefault(key, [[0] * len(metric.buckets), 0.0, 0])
+                        for index, count in enumerate(value[0][:len(metric.buckets)]):
+                            state[0][index] += count
+                        state[1] += value[1]
+                        state[2] += value[2]
+                    else:
+                        merged[key] = merged.get(key, 0) + value
+
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+
+            for key, value in sorted(merged.items()):
+                if metric.kind != "histogram":
+                    lines.append(f"{name}{_format_labels(metric.labelnames, key)} {_format_value(value)}")
+                    continue
+
+                cumulative = 0
+                bounds = list(metric.buckets) + [float("inf")]
+                counts = value[0] + [value[2] - sum(value[0])]
+                for bound, count in zip(bounds, counts):
+                    cumulative += count
+                    labels = _format_labels(metric.labelnames + ("le",), key + (_format_value(bound),))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _format_labels(metric.labelnames, key)
+                lines.append(f"{name}_sum{labels} {_format_value(value[1])}")
+                lines.append(f"{name}_count{labels} {value[2]}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status code.",
+    ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route")
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served.",
+    ("method",)
+)
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time by statement shape.",
+    ("statement",)
+)
+db_query_rows_total = registry.counter(
+    "db_query_rows_total", "Rows returned (SELECT) or affected (DML) by statement shape.",
+    ("statement",)
+)
+db_query_errors_total = registry.counter(
+    "db_query_errors_total", "Failed SQL statements by statement shape.",
+    ("statement",)
+)
+db_pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled database connection.",
+    ("pool",)
+)
+scheduler_job_duration_seconds = registry.histogram(
+    "scheduler_job_duration_seconds", "Scheduler job run time.",
+    ("job",), buckets=JOB_BUCKETS
+)
+scheduler_job_runs_total = registry.counter(
+    "scheduler_job_runs_total", "Scheduler job runs by outcome.",
+    ("job", "outcome")
+)
+scheduler_leader = registry.gauge(
+    "scheduler_leader", "1 in the worker holding the scheduler lease."
+)
+
+# metrics summed only over live processes when merging snapshots
+_LIVE_ONLY = {"http_requests_in_progress", "scheduler_leader"}
+
+
+class MetricsMiddleware:
+    """ASGI middleware, labels requests with the matched route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec(method=method)
+
+            # set by the router once a route matched, the raw path would explode the label set
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "<unmatched>"
+
+            http_request_duration_seconds.observe(elapsed, method=method, route=template)
+            http_requests_total.inc(method=method, route=template, status=status_code)
+
+
+def observe_pool_checkout(seconds: float, pool: str = "write"):
+    if settings.METRICS_ENABLED:
+        db_pool_checkout_seconds.observe(seconds, pool=pool)
+
+
+def timed_job(name: str, func):
+    """Wrap an async scheduler job to record its duration and outcome."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await func(*args, **kwargs)
+            outcome = "success"
+            return result
+        finally:
+            scheduler_job_duration_seconds.observe(time.perf_counter() - started, job=name)
+            scheduler_job_runs_total.inc(job=name, outcome=outcome)
+    return wrapper
+
+
+# multiprocess aggregation
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(settings.METRICS_MULTIPROC_DIR, f"metrics_{pid}.json")
+
+
+def write_snapshot():
+    """Write this process' metrics to METRICS_MULTIPROC_DIR (atomic replace)."""
+    if not settings.METRICS_MULTIPROC_DIR:
+        return
+
+    path = _snapshot_path(os.getpid())
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(registry.snapshot(), file)
+    os.replace(temporary, path)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_snapshots() -> list[dict]:
+    snapshots = []
+    directory = settings.METRICS_MULTIPROC_DIR
+
+    for filename in os.listdir(directory):
+        if not (filename.startswith("metrics_") and filename.endswith(".json")):
+            continue
+
+        pid = int(filename[len("metrics_"):-len(".json")])
+        try:
+            with open(os.path.join(directory, filename)) as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            continue
+
+        if pid != os.getpid() and not _process_alive(pid):
+            for name in _LIVE_ONLY:
+                snapshot.pop(name, None)
+        snapshots.append(snapshot)
+
+    return snapshots
+
+
+def render_metrics() -> str:
+    if not settings.METRICS_MULTIPROC_DIR:
+        return registry.render([registry.snapshot()])
+
+    write_snapshot()
+    return registry.render(_read_snapshots())
+
+
+async def flush_periodically():
+    """Lifespan task keeping this worker's snapshot fresh for the other workers."""
+    if not settings.METRICS_MULTIPROC_DIR:
+        return
+
+    os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+    try:
+        while True:
+            await asyncio.to_thread(write_snapshot)
+            await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+    finally:
+        write_snapshot()
@@ -0,0 +1,57 @@
+"""
+JSON response fast path.
+
+`ORJSONResponse` is the application's default response class. List routes
+whose service output is already shaped like the response model return
+`trusted_response(...)`. FastAPI skips `response_model` validation for a
+returned `Response`, so the rows are serialized once by orjson instead of
+being revalidated and re-encoded one by one.
+
+With `RESPONSE_VALIDATION` enabled (development / tests) the payload is
+validated through a cached `TypeAdapter` of the response model first, so a
+service that drifts from its model still fails loudly.
+"""
+import functools
+from typing import Any
+
+import orjson
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+from .config import settings
+
+
+__all__ = ["ORJSONResponse", "type_adapter", "trusted_response"]
+
+
+@functools.lru_cache(maxsize=None)
+def type_adapter(model: Any) -> TypeAdapter:
+    """Build the validator/serializer for `model` once per process."""
+    return TypeAdapter(model)
+
+
+def trusted_response(
+    content: Any,
+    model: Any,
+    response: Response | None = None,
+    status_code: int = 200
+) -> Response:
+    """
+    Serialize service output for `model` without per-row revalidation.
+
+    Pass the route's injected `response` to keep headers set by dependencies
+    (e.g. the ETag of a conditional GET), FastAPI does not merge them into a
+    returned response.
+    """
+    if settings.RESPONSE_VALIDATION:
+        adapter = type_adapter(model)
+        body = adapter.dump_json(adapter.validate_python(content))
+    else:
+        body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+    trusted = Response(content=body, status_code=status_code, media_type="application/json")
+    if response is not None:
+        trusted.headers.raw.extend(response.headers.raw)
+    return trusted
@@ -1,12 +1,106 @@
-from passlib.context import CryptContext 
+import asyncio
+import time
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto"
-)
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from .config import settings
+
+_pwd_context = None
+
+def get_pwd_context():
+    # passlib is imported on first use, it is not needed to serve most requests
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto"
+        )
+    return _pwd_context
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+# bcrypt takes ~200ms of CPU per call, the async variants below run it on a
+# bounded pool so the event loop keeps serving other requests meanwhile.
+
+_executor: Executor | None = None
+
+_metrics = {
+    "pending": 0,           # submitted and not finished yet
+    "completed": 0,
+    "hash_seconds_total": 0.0,
+    "hash_seconds_max": 0.0,
+    "wait_seconds_total": 0.0,
+}
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash"
+            )
+    return _executor
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+async def _run_in_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    submitted = time.perf_counter()
+
+    _metrics["pending"] += 1
+    try:
+        result, elapsed = await loop.run_in_executor(_get_executor(), _timed, func, *args)
+    finally:
+        _metrics["pending"] -= 1
+
+    _metrics["completed"] += 1
+    _metrics["hash_seconds_total"] += elapsed
+    _metrics["hash_seconds_max"] = max(_metrics["hash_seconds_max"], elapsed)
+    _metrics["wait_seconds_total"] += (time.perf_counter() - submitted) - elapsed
+
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+def password_hash_metrics() -> dict:
+    completed = _metrics["completed"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "executor": settings.PASSWORD_HASH_EXECUTOR,
+        "pending": _metrics["pending"],
+        "queue_depth": max(_metrics["pending"] - settings.PASSWORD_HASH_WORKERS, 0),
+        "completed": completed,
+        "hash_seconds_total": _metrics["hash_seconds_total"],
+        "hash_seconds_avg": _metrics["hash_seconds_total"] / completed if completed else 0.0,
+        "hash_seconds_max": _metrics["hash_seconds_max"],
+        "wait_seconds_avg": _metrics["wait_seconds_total"] / completed if completed else 0.0,
+    }
+
+
+def shutdown_password_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,37 @@
+import logging
+import time
+
+from contextlib import contextmanager
+
+
+logger = logging.getLogger("app.startup")
+
+
+class StartupProfiler:
+    """Collects wall-clock time per startup phase for the startup report."""
+
+    def __init__(self):
+        self.phases: list[tuple[str, float]] = []
+
+
+    def record(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+
+    def report(self) -> str:
+        total = sum(seconds for _name, seconds in self.phases)
+        lines = [f"{name:<24}{seconds * 1000:>10.1f} ms" for name, seconds in self.phases]
+        lines.append(f"{'total':<24}{total * 1000:>10.1f} ms")
+
+        report = "\n".join(lines)
+        logger.info("startup timing report\n%s", report)
+        return report
@@ -24,3 +24,5 @@ class DashboardSearchResponse(BaseModel):
     patients: List[PatientSummary]
     appointments: List[AppointmentResponse]
     departments: List[DepartmentResponse]
+    # categories that missed the request deadline and were left empty
+    incomplete: List[str] = []
@@ -2,6 +2,7 @@ from typing import Optional, List
 from datetime import date as Date
 from pydantic import Field
 from .api_base_model import TunedModel
+from ...core.config import settings
 
 
 class TreatmentCreate(TunedModel):
@@ -16,20 +17,15 @@ class TreatmentCreate(TunedModel):
 
 
 class PatientHistoryResponse(TunedModel):
+    appointment_id: str
+    date: Date
     visit_type: str
+    doctor_id: str
+    doctor_name: str
     test_done: Optional[str]
     diagnosis: Optional[str]
     prescription: Optional[str]
-
-
-class PatientDoctorData(TunedModel):
-    patient_name: str
-    doctor_name: str
-
-
-class PatientHistoryData(TunedModel):
-    patient_doctor_data: PatientDoctorData
-    patient_history: List[PatientHistoryResponse]
+    follow_up_date: Optional[str]
 
 
 # Appointment Schema
@@ -52,6 +48,23 @@ class AppointmentCreate(TunedModel):
     reason: Optional[str] = None
 
 
+class AppointmentBulkCreate(TunedModel):
+    appointments: List[AppointmentCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+class AppointmentBulkItemResult(TunedModel):
+    index: int
+    status: str                     # "created" | "conflict" | "invalid"
+    appointment_id: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class AppointmentBulkResponse(TunedModel):
+    created: int
+    failed: int
+    results: List[AppointmentBulkItemResult]
+
+
 class AppointmentResponse(TunedModel):
     appointment_id: str
     doctor_id: str
@@ -1,5 +1,8 @@
+from typing import Optional, Annotated, Any, List
 from datetime import date as Date
+from pydantic import Field
 from .api_base_model import TunedModel
+from ...core.config import settings
 
 class DoctorAvailabilityBase(TunedModel):
     doctor_id: str
@@ -10,10 +13,41 @@ class DoctorAvailabilityBase(TunedModel):
 class DoctorAvailabilityUpdate(TunedModel):
     morning_available: bool
     evening_available: bool
+    # remaining bookable slots, left unchanged when omitted
+    morning_slots: Optional[Annotated[int, Field(ge=0)]] = None
+    evening_slots: Optional[Annotated[int, Field(ge=0)]] = None
 
 class DoctorAvailabilityResponse(TunedModel):
     date: Date
     morning_available: bool
     evening_available: bool
+    morning_slots: Optional[int] = None
+    evening_slots: Optional[int] = None
 
 
+class DoctorAvailabilityChange(DoctorAvailabilityBase):
+    # remaining bookable slots, left unchanged (or the shift capacity for new days) when omitted
+    morning_slots: Optional[Annotated[int, Field(ge=0)]] = None
+    evening_slots: Optional[Annotated[int, Field(ge=0)]] = None
+
+class DoctorAvailabilityBulkUpdate(TunedModel):
+    changes: List[DoctorAvailabilityChange] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+class DoctorAvailabilityDiff(TunedModel):
+    doctor_id: str
+    date: Date
+    action: str                         # "created" | "updated"
+    # field -> [old, new], old is None for created days
+    fields: dict[str, List[Any]]
+
+class DoctorAvailabilityBulkError(TunedModel):
+    doctor_id: str
+    date: Date
+    detail: str
+
+class DoctorAvailabilityBulkResponse(TunedModel):
+    created: int
+    updated: int
+    unchanged: int
+    diff: List[DoctorAvailabilityDiff]
+    errors: List[DoctorAvailabilityBulkError]
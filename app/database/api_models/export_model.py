@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ExportTable(str, Enum):
+    appointment = "appointment"
+    patient = "patient"
+    treatment = "treatment"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
@@ -9,7 +9,7 @@ class PatientSummary(TunedModel):
     patient_name: str 
     email: EmailStr
     phone_no: str = Field(..., max_length=15)
-    emergency_contact: str = Field(None, max_length=15)
+    emergency_contact: Optional[str] = Field(None, max_length=15)
 
 
 class PatientBase(TunedModel):
@@ -17,7 +17,7 @@ class PatientBase(TunedModel):
     email: EmailStr
     gender: str = Field(..., max_length=6)
     phone_no: str = Field(..., max_length=15)
-    emergency_contact: str = Field(None, max_length=15)
+    emergency_contact: Optional[str] = Field(None, max_length=15)
     date_of_birth: datetime 
     address: str 
     status: bool
@@ -37,7 +37,7 @@ class PateintCreate(TunedModel):
 
     gender: str = Field(..., max_length=6)
     phone_no: str = Field(..., max_length=15)
-    emergency_contact: str = Field(None, max_length=15)
+    emergency_contact: Optional[str] = Field(None, max_length=15)
     date_of_birth: datetime
     address: str 
     status: bool
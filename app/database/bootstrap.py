@@ -0,0 +1,48 @@
+from sqlalchemy.engine import Connection
+from sqlalchemy.future import select
+
+from .base import Base
+from .model import Admin
+from .migrations import (
+    LATEST_VERSION,
+    get_schema_version,
+    run_migrations
+)
+from .session import async_engine, AsyncSessionLocal
+
+
+def init_schema(connection: Connection) -> int:
+    """Create missing tables (reflects every table) and apply pending migrations."""
+    Base.metadata.create_all(bind=connection)
+    return run_migrations(connection)
+
+
+async def init_schema_async(skip_if_current: bool = True) -> tuple[int, bool]:
+    """
+    Schema setup on the async engine.
+
+    With `skip_if_current` a database already stamped with LATEST_VERSION is
+    trusted as is, so the per-table PRAGMA table_info reflection of
+    `create_all` is skipped. Returns (schema version, whether it was skipped).
+    """
+    async with async_engine.begin() as connection:
+        version = await connection.run_sync(get_schema_version)
+        if skip_if_current and version == LATEST_VERSION:
+            return version, True
+
+        return await connection.run_sync(init_schema), False
+
+
+async def ensure_super_admin(admin_id: str = "A1", email: str = "superadmin@hospital.com", password: str = "admin123") -> bool:
+    """Create the default super admin if missing, returns True when created."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Admin.admin_id).where(Admin.admin_id == admin_id))
+        if result.first():
+            return False
+
+        super_admin = Admin(admin_id=admin_id, email=email)
+        await super_admin.set_password_async(password)
+
+        db.add(super_admin)
+        await db.commit()
+        return True
@@ -0,0 +1,252 @@
+"""
+Versioned schema migrations.
+
+`Base.metadata.create_all` only creates missing tables, it never touches
+tables that already exist. Everything else (new indexes, triggers, data
+fixes) lives here as an ordered list of migrations. The applied version is
+stored in SQLite's `PRAGMA user_version`, so no extra bookkeeping table is
+needed.
+
+Every migration must be idempotent: on a fresh database `create_all` has
+already built the current schema and the migrations run on top of it.
+"""
+import logging
+
+from sqlalchemy.engine import Connection
+
+from .search_index import create_search_index
+from ..core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_schema_version(connection: Connection) -> int:
+    return connection.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def _set_schema_version(connection: Connection, version: int):
+    connection.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+
+def _add_column_if_missing(connection: Connection, table: str, column: str, definition: str) -> bool:
+    columns = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")}
+    if column in columns:
+        return False
+
+    connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+def _migration_1_hot_path_indexes(connection: Connection):
+    # the weekly availability job used to insert duplicates, keep the oldest row
+    connection.exec_driver_sql(
+        """
+        DELETE FROM doctor_availability
+        WHERE availability_id NOT IN (
+            SELECT MIN(availability_id)
+            FROM doctor_availability
+            GROUP BY doctor_id, date
+        )
+        """
+    )
+
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS ix_appointment_doctor_date_shift ON appointment (doctor_id, date, shift)",
+        "CREATE INDEX IF NOT EXISTS ix_appointment_patient_status ON appointment (patient_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_appointment_status_date ON appointment (status, date)",
+        "CREATE INDEX IF NOT EXISTS ix_treatment_appointment_id ON treatment (appointment_id)",
+        "CREATE INDEX IF NOT EXISTS ix_doctor_department_id ON doctor (department_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_doctor_availability_doctor_date ON doctor_availability (doctor_id, date)",
+    ):
+        connection.exec_driver_sql(statement)
+
+
+def _migration_2_pagination_index(connection: Connection):
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_appointment_date_id ON appointment (date, appointment_id)"
+    )
+
+
+def _migration_3_search_index(connection: Connection):
+    create_search_index(connection)
+
+
+def _migration_4_booking_capacity(connection: Connection):
+    # the old check-then-insert allowed double bookings, keep the first one active
+    connection.exec_driver_sql(
+        """
+        UPDATE appointment SET status = 'cancel'
+        WHERE status != 'cancel'
+          AND rowid NOT IN (
+            SELECT MIN(rowid) FROM appointment
+            WHERE status != 'cancel'
+            GROUP BY patient_id, doctor_id, date, shift
+          )
+        """
+    )
+
+    capacity = int(settings.SHIFT_CAPACITY)
+    added = [
+        _add_column_if_missing(connection, "doctor_availability", column, f"INTEGER NOT NULL DEFAULT {capacity}")
+        for column in ("morning_slots", "evening_slots")
+    ]
+
+    if any(added):
+        # existing future bookings already use up part of the capacity
+        connection.exec_driver_sql(
+            """
+            UPDATE doctor_availability
+            SET morning_slots = MAX(0, morning_slots - (
+                    SELECT COUNT(*) FROM appointment AS a
+                    WHERE a.doctor_id = doctor_availability.doctor_id
+                      AND a.date = doctor_availability.date
+                      AND a.shift = 'Morning' AND a.status = 'Booked'
+                )),
+                evening_slots = MAX(0, evening_slots - (
+                    SELECT COUNT(*) FROM appointment AS a
+                    WHERE a.doctor_id = doctor_availability.doctor_id
+                      AND a.date = doctor_availability.date
+                      AND a.shift = 'Evening' AND a.status = 'Booked'
+                ))
+            """
+        )
+
+    for statement in (
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_appointment_active_booking
+        ON appointment (patient_id, doctor_id, date, shift)
+        WHERE status != 'cancel'
+        """,
+        # a booking takes a slot of an available shift or the insert aborts
+        """
+        CREATE TRIGGER IF NOT EXISTS appointment_reserve_slot
+        BEFORE INSERT ON appointment
+        WHEN NEW.status = 'Booked'
+        BEGIN
+            SELECT RAISE(ABORT, 'shift_unavailable')
+            WHERE NOT EXISTS (
+                SELECT 1 FROM doctor_availability
+                WHERE doctor_id = NEW.doctor_id
+                  AND date = NEW.date
+                  AND CASE NEW.shift
+                        WHEN 'Morning' THEN morning_available AND morning_slots > 0
+                        WHEN 'Evening' THEN evening_available AND evening_slots > 0
+                        ELSE 0
+                      END
+            );
+            UPDATE doctor_availability
+            SET morning_slots = morning_slots - (NEW.shift = 'Morning'),
+                evening_slots = evening_slots - (NEW.shift = 'Evening')
+            WHERE doctor_id = NEW.doctor_id AND date = NEW.date;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS appointment_release_slot_on_cancel
+        AFTER UPDATE OF status ON appointment
+        WHEN OLD.status = 'Booked' AND NEW.status = 'cancel'
+        BEGIN
+            UPDATE doctor_availability
+            SET morning_slots = morning_slots + (OLD.shift = 'Morning'),
+                evening_slots = evening_slots + (OLD.shift = 'Evening')
+            WHERE doctor_id = OLD.doctor_id AND date = OLD.date;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS appointment_release_slot_on_delete
+        AFTER DELETE ON appointment
+        WHEN OLD.status = 'Booked'
+        BEGIN
+            UPDATE doctor_availability
+            SET morning_slots = morning_slots + (OLD.shift = 'Morning'),
+                evening_slots = evening_slots + (OLD.shift = 'Evening')
+            WHERE doctor_id = OLD.doctor_id AND date = OLD.date;
+        END
+        """,
+    ):
+        connection.exec_driver_sql(statement)
+
+
+def _migration_5_sweep_index(connection: Connection):
+    # the sweep only ever looks at Booked rows, a partial index stays small
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_appointment_booked_date ON appointment (date) WHERE status = 'Booked'"
+    )
+    connection.exec_driver_sql("DROP INDEX IF EXISTS ix_appointment_status_date")
+
+
+def _migration_6_table_versions(connection: Connection):
+    # create_all is skipped on fast boot when the version is current
+    connection.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS table_version (
+            table_name VARCHAR(64) NOT NULL PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+        """
+    )
+
+
+def _migration_7_scheduler_leader(connection: Connection):
+    connection.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS scheduler_lease (
+            name VARCHAR(32) NOT NULL PRIMARY KEY,
+            holder VARCHAR(128) NOT NULL,
+            expires_at FLOAT NOT NULL
+        )
+        """
+    )
+    connection.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS scheduler_job_run (
+            job_id VARCHAR(64) NOT NULL PRIMARY KEY,
+            last_run_at FLOAT NOT NULL
+        )
+        """
+    )
+
+
+def _migration_8_patient_history_index(connection: Connection):
+    # newest-first history pages seek on this index without a sort,
+    # it covers every lookup of the (patient_id, status) index it replaces
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_appointment_patient_history "
+        "ON appointment (patient_id, status, date, appointment_id)"
+    )
+    connection.exec_driver_sql("DROP INDEX IF EXISTS ix_appointment_patient_status")
+
+
+# (version, description, migration) -- append only, never renumber
+MIGRATIONS = [
+    (1, "indexes for booking, history, sweep and availability lookups", _migration_1_hot_path_indexes),
+    (2, "keyset pagination index for appointments", _migration_2_pagination_index),
+    (3, "FTS5 trigram search index for the admin dashboard", _migration_3_search_index),
+    (4, "per-shift booking capacity, unique active bookings and slot triggers", _migration_4_booking_capacity),
+    (5, "partial index for the missed appointment sweep", _migration_5_sweep_index),
+    (6, "per-table change versions for conditional GETs", _migration_6_table_versions),
+    (7, "scheduler leader lease and job run history", _migration_7_scheduler_leader),
+    (8, "patient history pagination index", _migration_8_patient_history_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def run_migrations(connection: Connection) -> int:
+    """Apply every pending migration on `connection` and return the new version.
+
+    The caller owns the transaction, e.g. `with engine.begin() as conn`, so a
+    failing migration leaves the database at its previous version.
+    """
+    current = get_schema_version(connection)
+
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+
+        logger.info("applying schema migration %s: %s", version, description)
+        migration(connection)
+        _set_schema_version(connection, version)
+        current = version
+
+    return current
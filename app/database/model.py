@@ -5,13 +5,27 @@ from sqlalchemy import (
     Text,
     Boolean,
     Date,
+    Float,
     ForeignKey,
+    Index,
+    text,
 )
 
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 
 from .base import Base 
-from ..core.security import hash_password, verify_password
+from ..core.config import settings
+from ..core.security import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_password_async
+)
+
+
+# with RAISE_ON_LAZY_LOAD an unplanned lazy load raises instead of silently
+# issuing a query (debug / CI), load relationships explicitly with selectinload
+_LAZY = "raise" if settings.RAISE_ON_LAZY_LOAD else "select"
 
 
 class Admin(Base):
@@ -29,6 +43,15 @@ class Admin(Base):
             plain_password=password
         )
 
+    async def set_password_async(self, password: str):
+        self.password_hash = await hash_password_async(password=password)
+
+    async def check_password_async(self, password: str) -> bool:
+        return await verify_password_async(
+            hashed_password=self.password_hash,
+            plain_password=password
+        )
+
 
 class Doctor(Base):
     __tablename__ = "doctor"
@@ -40,10 +63,11 @@ class Doctor(Base):
 
     gender = Column(String(6), nullable=False)
 
-    qualification = Column(Text, nullable=False)
+    # large free text, deferred: loaded only on access or with undefer()
+    qualification = deferred(Column(Text, nullable=False))
     experience = Column(Integer, nullable=False)
     special_experience = Column(Integer, nullable=False)
-    speciality = Column(Text, nullable=False)
+    speciality = deferred(Column(Text, nullable=False))
 
     phone_no = Column(Integer, nullable=False)
 
@@ -58,13 +82,19 @@ class Doctor(Base):
     appointments = relationship(
         "Appointment",
         back_populates="doctor",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy=_LAZY
     )
 
     department = relationship(
         "Department",
         back_populates="doctors",
-        foreign_keys=[department_id]
+        foreign_keys=[department_id],
+        lazy=_LAZY
+    )
+
+    __table_args__ = (
+        Index("ix_doctor_department_id", "department_id"),
     )
 
     def set_password(self, password: str):
@@ -75,6 +105,15 @@ class Doctor(Base):
             hashed_password=self.password_hash, 
             plain_password=password
         )
+
+    async def set_password_async(self, password: str):
+        self.password_hash = await hash_password_async(password=password)
+
+    async def check_password_async(self, password: str) -> bool:
+        return await verify_password_async(
+            hashed_password=self.password_hash,
+            plain_password=password
+        )
     
 
 class Patient(Base):
@@ -91,15 +130,16 @@ class Patient(Base):
     emergency_contact = Column(String(15))
 
     date_of_birth = Column(Date, nullable=False)
-    address = Column(Text, nullable=False)
+    address = deferred(Column(Text, nullable=False))
 
     status = Column(Boolean, nullable=False)
-    medical_history = Column(Text)
+    medical_history = deferred(Column(Text))
 
     appointments = relationship(
         "Appointment",
         back_populates="patient",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy=_LAZY
     )
 
     def set_password(self, password: str):
@@ -110,6 +150,15 @@ class Patient(Base):
             hashed_password=self.password_hash, 
             plain_password=password
         )
+
+    async def set_password_async(self, password: str):
+        self.password_hash = await hash_password_async(password=password)
+
+    async def check_password_async(self, password: str) -> bool:
+        return await verify_password_async(
+            hashed_password=self.password_hash,
+            plain_password=password
+        )
     
 
 class Department(Base):
@@ -118,18 +167,20 @@ class Department(Base):
     department_name = Column(String(100), nullable=False)
     head_of_department = Column(String(8), ForeignKey("doctor.doctor_id"))    
     location = Column(String(30), nullable=False)
-    description = Column(Text)
+    description = deferred(Column(Text))
 
     doctors = relationship(
         "Doctor",
         back_populates="department",
         foreign_keys="Doctor.department_id",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy=_LAZY
     )
 
     head = relationship(
         "Doctor", 
-        foreign_keys=[head_of_department]
+        foreign_keys=[head_of_department],
+        lazy=_LAZY
     )
 
 
@@ -146,15 +197,34 @@ class Appointment(Base):
     shift = Column(String(10), nullable=False)
     status = Column(String(12), nullable=False)
     
-    reason = Column(Text) 
+    reason = deferred(Column(Text))
 
-    patient = relationship("Patient", back_populates="appointments")
-    doctor = relationship("Doctor", back_populates='appointments')
+    patient = relationship("Patient", back_populates="appointments", lazy=_LAZY)
+    doctor = relationship("Doctor", back_populates='appointments', lazy=_LAZY)
     treatment = relationship(
         "Treatment", 
         back_populates="appointment", 
         uselist=False, 
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy=_LAZY
+    )
+
+    __table_args__ = (
+        # booking duplicate check / per-doctor schedule
+        Index("ix_appointment_doctor_date_shift", "doctor_id", "date", "shift"),
+        # paginated patient history and per-patient listings
+        Index("ix_appointment_patient_history", "patient_id", "status", "date", "appointment_id"),
+        # nightly "missed appointment" sweep, only holds the Booked rows
+        Index("ix_appointment_booked_date", "date", sqlite_where=text("status = 'Booked'")),
+        # keyset pagination of /appointment/get/all
+        Index("ix_appointment_date_id", "date", "appointment_id"),
+        # one active booking per patient, doctor, day and shift
+        Index(
+            "uq_appointment_active_booking",
+            "patient_id", "doctor_id", "date", "shift",
+            unique=True,
+            sqlite_where=text("status != 'cancel'")
+        ),
     )
 
 
@@ -170,7 +240,12 @@ class Treatment(Base):
 
     appointment = relationship(
         "Appointment",
-        back_populates="treatment"
+        back_populates="treatment",
+        lazy=_LAZY
+    )
+
+    __table_args__ = (
+        Index("ix_treatment_appointment_id", "appointment_id"),
     )
 
 
@@ -181,3 +256,36 @@ class DoctorAvailability(Base):
     date = Column(Date, nullable=False)
     morning_available = Column(Boolean, default=False)
     evening_available = Column(Boolean, default=True)
+
+    # remaining bookable slots, decremented by the appointment_reserve_slot trigger
+    morning_slots = Column(Integer, nullable=False, default=settings.SHIFT_CAPACITY)
+    evening_slots = Column(Integer, nullable=False, default=settings.SHIFT_CAPACITY)
+
+    __table_args__ = (
+        Index("uq_doctor_availability_doctor_date", "doctor_id", "date", unique=True),
+    )
+
+
+class TableVersion(Base):
+    """Change counter per table, bumped by the service layer in the same
+    transaction as the write. Conditional GETs build their ETags from it."""
+    __tablename__ = "table_version"
+    table_name = Column(String(64), primary_key=True, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class SchedulerLease(Base):
+    """Leadership lease, the holder runs the scheduler jobs until
+    `expires_at` (epoch seconds) unless it renews it."""
+    __tablename__ = "scheduler_lease"
+    name = Column(String(32), primary_key=True, nullable=False)
+    holder = Column(String(128), nullable=False)
+    expires_at = Column(Float, nullable=False)
+
+
+class SchedulerJobRun(Base):
+    """Last successful run (epoch seconds) of every scheduler job, a new
+    leader catches up on the runs missed since."""
+    __tablename__ = "scheduler_job_run"
+    job_id = Column(String(64), primary_key=True, nullable=False)
+    last_run_at = Column(Float, nullable=False)
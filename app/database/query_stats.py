@@ -0,0 +1,89 @@
+"""
+Per-request SQL statistics (debug / CI mode, QUERY_STATS_ENABLED).
+
+`QueryStatsMiddleware` opens a `QueryStats` in a context variable for every
+HTTP request. The statement observer installed by `install_query_stats`
+counts the statements and DB time of the request, which is returned in the
+`X-Query-Count` and `X-DB-Time` (milliseconds) response headers. A statement
+executed QUERY_STATS_N1_THRESHOLD times or more within one request is logged
+to "app.sql.n_plus_one", the usual signature of an N+1 lazy load.
+"""
+import collections
+import contextvars
+import logging
+
+from sqlalchemy.engine import Engine
+
+from .sql_timing import TimedStatement, observe_statements
+from ..core.config import settings
+
+
+logger = logging.getLogger("app.sql.n_plus_one")
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: collections.Counter[str] = collections.Counter()
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+_current: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def install_query_stats(engine: Engine) -> Engine:
+    if not settings.QUERY_STATS_ENABLED:
+        return engine
+
+    def _count_statement(timed: TimedStatement):
+        stats = _current.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += timed.seconds
+            stats.statements[timed.statement] += 1
+
+    return observe_statements(engine, _count_statement)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware adding the per-request query headers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(stats.count).encode()))
+                headers.append((b"x-db-time", f"{stats.seconds * 1000:.3f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+
+            for statement, count in stats.repeated(settings.QUERY_STATS_N1_THRESHOLD):
+                route = getattr(scope.get("route"), "path", scope.get("path"))
+                logger.warning(
+                    "statement executed %s times in one request (possible N+1)", count,
+                    extra={"route": route, "statement": statement, "count": count}
+                )
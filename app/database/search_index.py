@@ -0,0 +1,106 @@
+"""
+SQLite FTS5 search index for the admin dashboard.
+
+Every searchable table gets an external content FTS5 table using the
+trigram tokenizer (case-insensitive substring matching), linked to the
+source row through its rowid. Triggers on the source tables keep the index
+in sync on every insert/update/delete, so the services never have to
+maintain it themselves.
+
+The source tables have no INTEGER PRIMARY KEY, which means `VACUUM` is
+allowed to renumber their rowids. Run `rebuild_search_index` after a
+VACUUM.
+"""
+from sqlalchemy.engine import Connection
+
+
+# category -> (fts table, source table, indexed columns)
+SEARCH_TABLES = {
+    "doctors": (
+        "search_doctor", "doctor",
+        ["doctor_id", "doctor_name", "email", "phone_no"]
+    ),
+    "patients": (
+        "search_patient", "patient",
+        ["patient_id", "patient_name", "phone_no", "emergency_contact"]
+    ),
+    "appointments": (
+        "search_appointment", "appointment",
+        ["appointment_id", "doctor_id", "patient_id", "visit_type", "status"]
+    ),
+    "departments": (
+        "search_department", "department",
+        ["department_id", "department_name", "head_of_department", "location", "description"]
+    ),
+}
+
+# shortest term the trigram tokenizer can match through the index
+MIN_MATCH_LENGTH = 3
+
+
+def _ddl(fts_table: str, source_table: str, columns: list[str]) -> list[str]:
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+
+    insert_new = (
+        f"INSERT INTO {fts_table}(rowid, {column_list}) "
+        f"VALUES (new.rowid, {new_values});"
+    )
+    delete_old = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+        f"VALUES ('delete', old.rowid, {old_values});"
+    )
+
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+            {column_list},
+            content='{source_table}',
+            content_rowid='rowid',
+            tokenize='trigram'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source_table} BEGIN
+            {insert_new}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source_table} BEGIN
+            {delete_old}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {source_table} BEGIN
+            {delete_old}
+            {insert_new}
+        END
+        """,
+    ]
+
+
+def create_search_index(connection: Connection):
+    for fts_table, source_table, columns in SEARCH_TABLES.values():
+        for statement in _ddl(fts_table, source_table, columns):
+            connection.exec_driver_sql(statement)
+
+    rebuild_search_index(connection)
+
+
+def rebuild_search_index(connection: Connection):
+    for fts_table, _source_table, _columns in SEARCH_TABLES.values():
+        connection.exec_driver_sql(
+            f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"
+        )
+
+
+def match_expression(term: str) -> str:
+    """Quote `term` as a single FTS5 phrase, i.e. a plain substring search."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def like_pattern(term: str) -> str:
+    """LIKE pattern for terms shorter than MIN_MATCH_LENGTH (escape char: '\\')."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
@@ -1,19 +1,92 @@
-from sqlalchemy import create_engine
+import functools
+import time
+
+from fastapi import Depends
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 
 from ..core.config import settings
+from .sql_logging import install_sql_logging
+from .sql_metrics import install_sql_metrics
+from .query_stats import install_query_stats
+from ..core.metrics import observe_pool_checkout
+
+
+def sqlite_pragmas(profile: str = settings.DB_PROFILE, read_only: bool = False) -> dict[str, str | int]:
+    """Connect-time PRAGMAs for the given engine profile."""
+    pragmas = {}
+    if profile == "production":
+        pragmas = {
+            "journal_mode": settings.SQLITE_JOURNAL_MODE,
+            "synchronous": settings.SQLITE_SYNCHRONOUS,
+            "mmap_size": settings.SQLITE_MMAP_SIZE,
+            "cache_size": settings.SQLITE_CACHE_SIZE,
+            "temp_store": settings.SQLITE_TEMP_STORE,
+            "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+            "foreign_keys": "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF",
+        }
+
+    if read_only:
+        # the journal mode is stored in the database file, the writer sets it
+        pragmas.pop("journal_mode", None)
+        pragmas["query_only"] = "ON"
+
+    return pragmas
+
+
+def apply_engine_profile(engine: Engine, profile: str = settings.DB_PROFILE, read_only: bool = False) -> Engine:
+    """Run the profile's PRAGMAs on every new DBAPI connection of `engine`."""
+    pragmas = sqlite_pragmas(profile, read_only)
+    if not pragmas or engine.dialect.name != "sqlite":
+        return engine
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return engine
+
 
 sync_engine = create_engine(
     settings.SQLALCHEMY_SYNC_DATABASE_URI,
-    echo=True
+    echo=settings.DB_ECHO
 )
 
 async_engine = create_async_engine(
     settings.SQLALCHEMY_ASYNC_DATABASE_URI,
-    echo=True  
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_WRITE_POOL_SIZE,
+    max_overflow=settings.DB_WRITE_MAX_OVERFLOW
 )
 
+# GET routes: same file opened read-only (mode=ro + PRAGMA query_only)
+read_async_engine = create_async_engine(
+    settings.SQLALCHEMY_READ_DATABASE_URI,
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_READ_POOL_SIZE,
+    max_overflow=settings.DB_READ_MAX_OVERFLOW
+)
+
+apply_engine_profile(sync_engine)
+apply_engine_profile(async_engine.sync_engine)
+apply_engine_profile(read_async_engine.sync_engine, read_only=True)
+
+install_sql_logging(sync_engine)
+install_sql_logging(async_engine.sync_engine)
+install_sql_logging(read_async_engine.sync_engine)
+
+install_sql_metrics(async_engine.sync_engine)
+install_sql_metrics(read_async_engine.sync_engine)
+install_query_stats(async_engine.sync_engine)
+install_query_stats(read_async_engine.sync_engine)
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -26,6 +99,40 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+AsyncReadSessionLocal = sessionmaker(
+    bind=read_async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 async def get_db():
     async with AsyncSessionLocal() as session:
+        # check the connection out up front to measure the pool wait
+        started = time.perf_counter()
+        await session.connection()
+        observe_pool_checkout(time.perf_counter() - started, pool="write")
+
         yield session
+
+
+async def get_read_db():
+    """Session on the read-only pool, any write through it fails."""
+    async with AsyncReadSessionLocal() as session:
+        started = time.perf_counter()
+        await session.connection()
+        observe_pool_checkout(time.perf_counter() - started, pool="read")
+
+        yield session
+
+
+@functools.lru_cache(maxsize=None)
+def read_only(service_cls):
+    """
+    Dependency building `service_cls` on a `get_read_db` session, for GET
+    routes: `service: DoctorService = Depends(read_only(DoctorService))`.
+    """
+    def dependency(db: AsyncSession = Depends(get_read_db)):
+        return service_cls(db)
+
+    dependency.__name__ = f"read_only_{service_cls.__name__}"
+    return dependency
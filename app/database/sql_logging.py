@@ -0,0 +1,49 @@
+"""
+Sampled SQL statement logging.
+
+Replaces `echo=True`, which logs every statement and parameter set from the
+event loop. Statements are logged to the "app.sql" logger when they are
+slower than SQL_LOG_SLOW_MS, or as 1 in SQL_LOG_SAMPLE_RATE of the rest.
+"""
+import itertools
+import logging
+
+from sqlalchemy.engine import Engine
+
+from .sql_timing import TimedStatement, observe_statements
+from ..core.config import settings
+
+
+logger = logging.getLogger("app.sql")
+
+
+def install_sql_logging(engine: Engine) -> Engine:
+    sample_rate = settings.SQL_LOG_SAMPLE_RATE
+    slow_ms = settings.SQL_LOG_SLOW_MS
+
+    if not sample_rate and slow_ms is None:
+        return engine
+
+    counter = itertools.count(1)
+
+    def _log_statement(timed: TimedStatement):
+        elapsed_ms = timed.seconds * 1000
+
+        if slow_ms is not None and elapsed_ms >= slow_ms:
+            level, reason = logging.WARNING, "slow"
+        elif sample_rate and next(counter) % sample_rate == 0:
+            level, reason = logging.INFO, "sampled"
+        else:
+            return
+
+        extra = {
+            "duration_ms": round(elapsed_ms, 3),
+            "reason": reason,
+            "executemany": timed.executemany,
+        }
+        if settings.SQL_LOG_PARAMS:
+            extra["parameters"] = timed.parameters
+
+        logger.log(level, "%s", timed.statement, extra=extra)
+
+    return observe_statements(engine, _log_statement)
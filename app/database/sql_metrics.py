@@ -0,0 +1,63 @@
+"""
+Per-statement-shape SQL timings for `/metrics`.
+
+A statement's shape is its verb and main table, e.g. "SELECT doctor" or
+"UPDATE appointment", which keeps the label set small no matter how many
+distinct statements (IN lists, projections) the services issue.
+"""
+import functools
+import re
+
+from sqlalchemy.engine import Engine
+
+from .sql_timing import TimedStatement, observe_statements
+from ..core.config import settings
+from ..core.metrics import (
+    db_query_duration_seconds,
+    db_query_rows_total,
+    db_query_errors_total
+)
+
+
+_TABLE_AFTER = re.compile(
+    r'\b(?:FROM|INTO|UPDATE|TABLE|INDEX|ON)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?["`\[]?(\w+)',
+    re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    words = statement.split(None, 2)
+    if not words:
+        return "UNKNOWN"
+
+    verb = words[0].upper()
+    if verb == "UPDATE" and len(words) > 1:
+        return f"UPDATE {words[1].strip(chr(34))}"
+
+    match = _TABLE_AFTER.search(statement)
+    return f"{verb} {match.group(1)}" if match else verb
+
+
+def _row_count(cursor) -> int:
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        return cursor.rowcount
+
+    # the aiosqlite adapter buffers SELECT results on execute
+    rows = getattr(cursor, "_rows", None)
+    return len(rows) if rows is not None else 0
+
+
+def install_sql_metrics(engine: Engine) -> Engine:
+    if not settings.METRICS_ENABLED:
+        return engine
+
+    def _record_statement(timed: TimedStatement):
+        shape = statement_shape(timed.statement)
+        db_query_duration_seconds.observe(timed.seconds, statement=shape)
+        db_query_rows_total.inc(_row_count(timed.cursor), statement=shape)
+
+    def _record_error(statement: str):
+        db_query_errors_total.inc(statement=statement_shape(statement))
+
+    return observe_statements(engine, _record_statement, _record_error)
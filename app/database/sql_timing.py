@@ -0,0 +1,90 @@
+"""
+Shared statement timing hook.
+
+Each engine gets one set of cursor events that times every statement. SQL
+logging, SQL metrics and the per-request query stats subscribe to it with
+`observe_statements` instead of each keeping its own start time stack.
+"""
+import time
+import weakref
+
+from typing import Any, Callable, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_STARTED_KEY = "sql_timing_started"
+
+
+class TimedStatement(NamedTuple):
+    statement: str
+    parameters: Any
+    executemany: bool
+    cursor: Any
+    seconds: float
+
+
+StatementObserver = Callable[[TimedStatement], None]
+ErrorObserver = Callable[[str], None]
+
+
+class _Observers:
+    __slots__ = ("on_statement", "on_error")
+
+    def __init__(self):
+        self.on_statement: list[StatementObserver] = []
+        self.on_error: list[ErrorObserver] = []
+
+
+_engines: "weakref.WeakKeyDictionary[Engine, _Observers]" = weakref.WeakKeyDictionary()
+
+
+def _install(engine: Engine, observers: _Observers):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        timed = TimedStatement(
+            statement,
+            parameters,
+            executemany,
+            cursor,
+            time.perf_counter() - conn.info[_STARTED_KEY].pop()
+        )
+        for observer in observers.on_statement:
+            observer(timed)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        started = exception_context.connection.info.get(_STARTED_KEY) if exception_context.connection else None
+        if started:
+            started.pop()
+
+        if exception_context.statement:
+            for observer in observers.on_error:
+                observer(exception_context.statement)
+
+
+def observe_statements(
+    engine: Engine,
+    on_statement: StatementObserver,
+    on_error: Optional[ErrorObserver] = None
+) -> Engine:
+    """
+    Call `on_statement` after every statement executed on `engine` and
+    `on_error` with the statement of every failed one. The cursor events are
+    installed on the first observer. For async engines pass
+    `async_engine.sync_engine`.
+    """
+    observers = _engines.get(engine)
+    if observers is None:
+        observers = _engines[engine] = _Observers()
+        _install(engine, observers)
+
+    observers.on_statement.append(on_statement)
+    if on_error is not None:
+        observers.on_error.append(on_error)
+    return engine
@@ -0,0 +1,155 @@
+"""
+Leader election for the scheduler over a lease row.
+
+Every worker starts the scheduler paused and runs `LeaderElection.run()`.
+Each heartbeat a worker renews the `scheduler_lease` row if it holds it,
+or takes it over once it has expired, in a single conditional upsert, so
+at most one worker holds an unexpired lease at a time. The holder resumes
+its scheduler, everybody else keeps theirs paused. A leader that dies
+stops renewing and another worker takes over within
+SCHEDULER_LEASE_SECONDS + SCHEDULER_HEARTBEAT_SECONDS; on shutdown the
+lease is released right away.
+
+The lease is compared against wall clock time, which is fine for workers
+on one host (the SQLite file is local anyway).
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.sqlite import insert
+
+from ..core.config import settings
+from ..core.metrics import scheduler_leader
+from ..database.model import SchedulerLease
+from ..database.session import AsyncSessionLocal
+
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    def __init__(
+        self,
+        name: str = "scheduler",
+        lease_seconds: float = settings.SCHEDULER_LEASE_SECONDS,
+        heartbeat_seconds: float = settings.SCHEDULER_HEARTBEAT_SECONDS,
+        on_elected: Optional[Callable[[], Awaitable[None]]] = None,
+        on_demoted: Optional[Callable[[], Awaitable[None]]] = None
+    ):
+        if heartbeat_seconds >= lease_seconds:
+            raise ValueError("the heartbeat must be shorter than the lease")
+
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._expires_at = 0.0
+
+
+    def holds_lease(self) -> bool:
+        """Leader with a lease that has not expired yet (checked before every job run)."""
+        return self.is_leader and time.time() < self._expires_at
+
+
+    async def _try_acquire(self) -> bool:
+        now = time.time()
+        expires_at = now + self.lease_seconds
+
+        statement = (
+            insert(SchedulerLease)
+            .values(name=self.name, holder=self.holder, expires_at=expires_at)
+            .on_conflict_do_update(
+                index_elements=[SchedulerLease.name],
+                set_={"holder": self.holder, "expires_at": expires_at},
+                where=or_(
+                    SchedulerLease.holder == self.holder,
+                    SchedulerLease.expires_at < now
+                )
+            )
+        )
+
+        async with AsyncSessionLocal() as db:
+            # followers only read until the lease runs out, no write lock
+            current = (await db.get(SchedulerLease, self.name))
+            if current and current.holder != self.holder and current.expires_at >= now:
+                return False
+
+            result = await db.execute(statement)
+            await db.commit()
+
+        if result.rowcount != 1:
+            return False
+
+        self._expires_at = expires_at
+        return True
+
+
+    async def release(self):
+        if not self.is_leader:
+            return
+
+        self.is_leader = False
+        scheduler_leader.set(0)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    SchedulerLease.holder == self.holder
+                )
+                .values(expires_at=0)
+            )
+            await db.commit()
+        logger.info("%s released the %s lease", self.holder, self.name)
+
+
+    async def _transition(self, leader: bool):
+        self.is_leader = leader
+        scheduler_leader.set(1 if leader else 0)
+
+        if leader:
+            logger.info("%s elected %s leader", self.holder, self.name)
+            callback = self.on_elected
+        else:
+            logger.warning("%s lost the %s lease", self.holder, self.name)
+            callback = self.on_demoted
+
+        if callback:
+            await callback()
+
+
+    async def run(self):
+        """Heartbeat loop, cancel it and call `release()` on shutdown."""
+        while True:
+            try:
+                acquired = await self._try_acquire()
+            except Exception as e:
+                # e.g. database locked, keep leading while the lease lasts
+                logger.warning("%s lease renewal failed: %s", self.name, e)
+                acquired = self.holds_lease()
+
+            if acquired != self.is_leader:
+                try:
+                    await self._transition(acquired)
+                except Exception:
+                    logger.exception("%s leadership change handler failed", self.name)
+                    if acquired:
+                        # not ready to lead, give the lease up and retry on the next heartbeat
+                        try:
+                            await self.release()
+                        except Exception as e:
+                            logger.warning("%s lease release failed: %s", self.name, e)
+                            self.is_leader = False
+                            scheduler_leader.set(0)
+
+            await asyncio.sleep(self.heartbeat_seconds)
@@ -1,23 +1,127 @@
+import asyncio
+import functools
+import logging
+import time
+from datetime import datetime, timedelta
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.future import select
+
+from .leader import LeaderElection
 from .tasks import Task
+from ..core.config import settings
+from ..core.metrics import timed_job
+from ..database.model import SchedulerJobRun
+from ..database.session import AsyncSessionLocal
+
+
+logger = logging.getLogger(__name__)
 
 scheduler = AsyncIOScheduler()
+election: LeaderElection | None = None
+_election_task: asyncio.Task | None = None
+
+
+def leader_job(job_id: str, func):
+    """
+    Run the job only while this worker holds the lease, and record every
+    successful run for the missed-run catch-up of the next leader.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if election is not None and not election.holds_lease():
+            logger.warning("skipping %s, not the scheduler leader", job_id)
+            return
+
+        result = await func(*args, **kwargs)
+
+        async with AsyncSessionLocal() as db:
+            statement = insert(SchedulerJobRun).values(job_id=job_id, last_run_at=time.time())
+            await db.execute(statement.on_conflict_do_update(
+                index_elements=[SchedulerJobRun.job_id],
+                set_={"last_run_at": statement.excluded.last_run_at}
+            ))
+            await db.commit()
+        return result
+    return wrapper
+
+
+async def catch_up_missed_runs():
+    """
+    Run every job whose last scheduled time passed since its last recorded
+    run (at most SCHEDULER_CATCHUP_HOURS back) right away, once.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(SchedulerJobRun.job_id, SchedulerJobRun.last_run_at))
+        last_runs = dict(result.all())
+
+    for job in scheduler.get_jobs():
+        timezone = job.trigger.timezone
+        now = datetime.now(timezone)
+        since = now - timedelta(hours=settings.SCHEDULER_CATCHUP_HOURS)
+        if job.id in last_runs:
+            since = max(since, datetime.fromtimestamp(last_runs[job.id], timezone))
+
+        missed = job.trigger.get_next_fire_time(None, since)
+        if missed is not None and missed <= now:
+            logger.info("catching up %s, missed the run of %s", job.id, missed.isoformat())
+            job.modify(next_run_time=now)
+
+
+async def _on_elected():
+    try:
+        await catch_up_missed_runs()
+    except Exception:
+        # e.g. database locked, the regular schedule still has to run
+        logger.exception("missed run catch-up failed")
+    scheduler.resume()
+
+
+async def _on_demoted():
+    scheduler.pause()
+
 
 def start_scheduler():
+    global election, _election_task
+
     if not scheduler.running:
         scheduler.add_job(
-            Task.update_appointment_status,
+            timed_job("update_appointment", leader_job("update_appointment", Task.update_appointment_status)),
             CronTrigger(hour=0, minute=5),
             id="update_appointment",
             replace_existing=True
         )
 
         scheduler.add_job(
-            Task.update_availability_dates,
-            CronTrigger(day_of_week="mon", hour=0, minute=5),
+            timed_job("update_availability", leader_job("update_availability", Task.update_availability_dates)),
+            # idempotent, running daily keeps the horizon rolling
+            CronTrigger(hour=0, minute=10),
             id="update_availability",
             replace_existing=True
         )
 
-        scheduler.start()
+        if not settings.SCHEDULER_LEADER_ELECTION:
+            scheduler.start()
+            return
+
+        # paused until this worker wins the lease
+        scheduler.start(paused=True)
+        election = LeaderElection(on_elected=_on_elected, on_demoted=_on_demoted)
+        _election_task = asyncio.get_running_loop().create_task(election.run())
+
+
+async def stop_scheduler():
+    if _election_task is not None:
+        _election_task.cancel()
+        try:
+            await _election_task
+        except asyncio.CancelledError:
+            pass
+
+    if scheduler.running:
+        scheduler.shutdown()
+
+    if election is not None:
+        await election.release()
@@ -1,56 +1,90 @@
-from fastapi import Depends
+import asyncio
+import time
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from datetime import date as Date
 from sqlalchemy.future import select
-from sqlalchemy import  and_
+from sqlalchemy import and_, text, update
 
-from ..database.model import (
-    Appointment,
-    DoctorAvailability,
-    Doctor
+from ..database.model import Appointment
+
+from app.core.config import settings
+from app.database.session import AsyncSessionLocal
+from app.service.availability_horizon import (
+    extend_availability_horizon,
+    prune_past_availability
 )
 
-from datetime import datetime, timedelta
-from datetime import date as Date
-from sqlalchemy.future import select
-from sqlalchemy import and_, delete
 
-from app.database.session import AsyncSessionLocal
+_BOOKED = text("appointment.status = 'Booked'")
 
 
 class Task:
 
     @staticmethod
-    async def update_appointment_status():
+    async def update_appointment_status(batch_size: int = settings.SWEEP_BATCH_SIZE) -> dict:
+        """
+        Mark past Booked appointments as Missed.
+
+        Runs as a set-based UPDATE over at most `batch_size` rows per
+        transaction, so the write lock is released between batches and no
+        rows are loaded into the session. Yields to the event loop after every
+        batch.
+        """
         print(f"[{datetime.now()}] Running update_appointment_status")
 
-        async with AsyncSessionLocal() as db:
-            today_date = Date.today()
+        started = time.perf_counter()
+        today_date = Date.today()
+        updated = 0
+        batches = 0
 
-            query = select(Appointment).where(
+        # literal 'Booked' so the planner can use the partial ix_appointment_booked_date
+        candidates = (
+            select(Appointment.appointment_id)
+            .where(
                 and_(
-                    Appointment.status == "Booked",
+                    _BOOKED,
                     Appointment.date < today_date
                 )
             )
-            
-            result = await db.execute(query)
-            appointments = result.scalars().all()
+            .limit(batch_size)
+        )
+        sweep = (
+            update(Appointment)
+            .where(Appointment.appointment_id.in_(candidates.scalar_subquery()))
+            .values(status="Missed")
+            .execution_options(synchronize_session=False)
+        )
 
-            if not appointments:
-                print("No past appointments found.")
-                return
+        async with AsyncSessionLocal() as db:
+            while True:
+                try:
+                    result = await db.execute(sweep)
+                    await db.commit()
+                except Exception as e:
+                    await db.rollback()
+                    print(f"Error: {e}")
+                    # fail the run, leader_job must not record it as done
+                    raise
 
-            for appointment in appointments:
-                appointment.status = "Missed"
+                if result.rowcount <= 0:
+                    break
 
-            try:
-                await db.commit()
-                print(f"Updated {len(appointments)} appointments to Missed")
-            except Exception as e:
-                await db.rollback()
-                print(f"Error: {e}")
+                updated += result.rowcount
+                batches += 1
+
+                if result.rowcount < batch_size:
+                    break
+
+                await asyncio.sleep(0)
+
+        report = {
+            "rows": updated,
+            "batches": batches,
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+        print(f"Updated {updated} appointments to Missed in {batches} batches ({report['seconds']}s)")
+        return report
 
 
     @staticmethod
@@ -58,38 +92,12 @@ class Task:
         print(f"[{datetime.now()}] Running update_availability_dates")
 
         async with AsyncSessionLocal() as db:
-            today = Date.today()
-            start_of_week = today - timedelta(days=today.weekday())
-
-            # delete past availability
-            await db.execute(
-                delete(DoctorAvailability).where(
-                    DoctorAvailability.date < start_of_week
-                )
-            )
-
-            doctors = (
-                await db.execute(
-                    select(Doctor).where(Doctor.status == True)
-                )
-            ).scalars().all()
-
-            new_availability = [
-                DoctorAvailability(
-                    doctor_id=doctor.doctor_id,
-                    date=start_of_week + timedelta(days=i),
-                    morning_available=False,
-                    evening_available=False
-                )
-                for doctor in doctors
-                for i in range(7)
-            ]
-
-            db.add_all(new_availability)
-
             try:
+                pruned = await prune_past_availability(db)
+                created = await extend_availability_horizon(db)
                 await db.commit()
-                print(f"Added {len(new_availability)} availability records")
+                print(f"Added {created} availability records, removed {pruned} past records")
             except Exception as e:
                 await db.rollback()
                 print(f"Error: {e}")
+                raise
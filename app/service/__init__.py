@@ -5,3 +5,4 @@ from .doctor_availabiliry_service import DoctorAvailabilityService
 from .doctor_service import DoctorService
 from .patient_service import PatientService
 from .treatment_service import TreatmentService
+from .export_service import ExportService
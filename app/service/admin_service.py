@@ -1,129 +1,128 @@
 import asyncio
 
-from fastapi import (
-    Depends, 
-    HTTPException,
-    status
-)
+from fastapi import Depends
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select 
-from sqlalchemy.orm import selectinload
-from sqlalchemy import or_
-
-from ..database.session import get_db
-from ..database.model import (
-    Doctor,
-    Department,
-    Patient,
-    Appointment
+
+from ..core.config import settings
+from ..database.session import get_db, AsyncReadSessionLocal
+from ..database.search_index import (
+    SEARCH_TABLES,
+    MIN_MATCH_LENGTH,
+    match_expression,
+    like_pattern
 )
 
+
+# category -> (select list, extra joins) over the source table aliased as `t`
+_RESULT_COLUMNS = {
+    "doctors": (
+        """
+        t.doctor_id,
+        t.doctor_name,
+        CAST(t.phone_no AS TEXT) AS phone_no,
+        COALESCE(dep.department_name, 'Null') AS department_name
+        """,
+        "LEFT JOIN department AS dep ON dep.department_id = t.department_id"
+    ),
+    "patients": (
+        "t.patient_id, t.patient_name, t.email, t.phone_no, t.emergency_contact",
+        ""
+    ),
+    "appointments": (
+        "t.appointment_id, t.doctor_id, t.patient_id, t.visit_type, t.date, t.status, t.shift",
+        ""
+    ),
+    "departments": (
+        "t.department_id, t.department_name, t.location, t.description, t.head_of_department",
+        ""
+    ),
+}
+
+
 class AdminService:
     def __init__(self, db: AsyncSession = Depends(get_db)):
-        self.db = db 
-
-    
-    async def query_(self, query_string: str):
-        search_item = f"%{query_string}%"
-
-        doctor_query = (
-            select(Doctor)
-            .options(selectinload(Doctor.department))
-            .where(
-                or_(
-                    Doctor.doctor_id.like(search_item),
-                    Doctor.doctor_name.like(search_item),
-                    Doctor.email.like(search_item),
-                    Doctor.phone_no.like(search_item)
-                )
-            )
-        )
+        self.db = db
 
-        patient_query = (
-            select(Patient)
-            .where(
-                or_(
-                    Patient.patient_id.like(search_item),
-                    Patient.patient_name.like(search_item),
-                    Patient.phone_no.like(search_item),
-                    Patient.emergency_contact.like(search_item)
-                )
-            )
-        )
 
-        appointment_query = (
-            select(Appointment)
-            .where(
-                or_(
-                    Appointment.appointment_id.like(search_item),
-                    Appointment.doctor_id.like(search_item),
-                    Appointment.patient_id.like(search_item),
-                    Appointment.visit_type.like(search_item),
-                    Appointment.status.like(search_item),
-                )
-            )
+    async def search_category_(self, db: AsyncSession, category: str, query_string: str, limit: int) -> list[dict]:
+        fts_table, source_table, columns = SEARCH_TABLES[category]
+        select_list, joins = _RESULT_COLUMNS[category]
+
+        if len(query_string) >= MIN_MATCH_LENGTH:
+            # ranked (bm25) trigram match through the index
+            where = f"s.{fts_table} MATCH :term"
+            order_by = "s.rank"
+            term = match_expression(query_string)
+        else:
+            # too short for trigrams, falls back to a scan of the indexed columns
+            where = " OR ".join(f"s.{column} LIKE :term ESCAPE '\\'" for column in columns)
+            order_by = "s.rowid"
+            term = like_pattern(query_string)
+
+        query = text(
+            f"""
+            SELECT {select_list}
+            FROM {fts_table} AS s
+            JOIN {source_table} AS t ON t.rowid = s.rowid
+            {joins}
+            WHERE {where}
+            ORDER BY {order_by}
+            LIMIT :limit
+            """
         )
 
-        department_query = (
-            select(Department)
-            .where(
-                or_(
-                    Department.department_id.like(search_item),
-                    Department.department_name.like(search_item),
-                    Department.head_of_department.like(search_item),
-                    Department.location.like(search_item),
-                    Department.description.like(search_item)
+        result = await db.execute(query, {"term": term, "limit": limit})
+        return [dict(row) for row in result.mappings().all()]
+
+
+    async def _search_in_own_session(self, semaphore: asyncio.Semaphore, category: str, query_string: str, limit: int) -> list[dict]:
+        async with semaphore:
+            async with AsyncReadSessionLocal() as db:
+                return await self.search_category_(
+                    db,
+                    category=category,
+                    query_string=query_string,
+                    limit=limit
                 )
-            )
-        )
 
-        doctor_result = await self.db.execute(doctor_query)
-        patient_result = await self.db.execute(patient_query)
-        appointment_result = await self.db.execute(appointment_query)
-        deaprtment_result = await self.db.execute(department_query)
-        
-
-        doctors = doctor_result.scalars().all()
-        patients = patient_result.scalars().all()
-        appointments = appointment_result.scalars().all() 
-        departments = deaprtment_result.scalars().all()
-
-        return {
-            "doctors": [
-                {
-                    "doctor_id": d.doctor_id,
-                    "doctor_name": d.doctor_name,
-                    "phone_no": str(d.phone_no),
-                    "department_name": d.department.department_name if d.department else "Null"
-                } for d in doctors
-            ],
-            "patients": [
-                {
-                    "patient_id": p.patient_id,
-                    "patient_name": p.patient_name,
-                    "email": p.email,
-                    "phone_no": str(p.phone_no),
-                    "emergency_contact": str(p.emergency_contact)
-                } for p in patients
-            ],
-            "appointments": [
-                {
-                    "appointment_id": a.appointment_id,
-                    "doctor_id": a.doctor_id,
-                    "patient_id": a.patient_id,
-                    "visit_type": a.visit_type,
-                    "date": str(a.date),
-                    "status": str(a.status)
-                } for a in appointments
-            ],
-            "departments": [
-                {
-                    "department_id": dp.department_id,
-                    "department_name": dp.department_name,
-                    "head": dp.head_of_department,
-                    "location": dp.location
-                } for dp in departments
-            ]
+
+    async def query_(self, query_string: str, limit: int = settings.SEARCH_RESULTS_PER_CATEGORY, timeout: float | None = None):
+        """
+        Search every category concurrently. The first one runs on the
+        injected session, the others each on their own session (and
+        therefore their own pooled connection, at most SEARCH_CONCURRENCY
+        at a time).
+
+        With `timeout` (seconds) the categories that have not finished by then
+        are cancelled, returned empty and listed under "incomplete".
+        """
+        semaphore = asyncio.Semaphore(settings.SEARCH_CONCURRENCY)
+        first, *others = SEARCH_TABLES
+        tasks = {
+            first: asyncio.create_task(
+                self.search_category_(self.db, category=first, query_string=query_string, limit=limit)
+            ),
+            **{
+                category: asyncio.create_task(
+                    self._search_in_own_session(semaphore, category, query_string, limit)
+                ) for category in others
+            }
         }
-    
\ No newline at end of file
+
+        _done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        # wait for the cancellations so their pooled connections are checked back in
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        results = {"incomplete": []}
+        for category, task in tasks.items():
+            if task in pending:
+                results[category] = []
+                results["incomplete"].append(category)
+            else:
+                results[category] = task.result()
+
+        return results
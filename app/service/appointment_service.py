@@ -7,46 +7,59 @@ from fastapi import (
 from sqlalchemy.ext.asyncio import AsyncSession 
 from sqlalchemy.future import select 
 from sqlalchemy.orm import selectinload
-from sqlalchemy import or_ , and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import or_ , and_, insert
 
+from ..core.cache import cache
 from ..database.session import get_db 
 from ..database.model import (
     Appointment,
-    DoctorAvailability
+    Doctor,
+    DoctorAvailability,
+    Patient
 )
 
 from .helper import (
     generate_new_appointment_id,
-    validate_date_format
+    validate_date_format,
+    booking_conflict,
+    booking_conflict_detail
 )
+from .pagination import (
+    keyset,
+    split_page,
+    approximate_total
+)
+from .table_version import bump_table_version
 
 from ..database.api_models.appointment_treatment_model import (
     AppointmentResponse,
-    AppointmentBase
+    AppointmentBase,
+    AppointmentBulkCreate
 )
 
 import datetime
 
 
+# generated appointment ids are short and can collide, retry with a new one
+APPOINTMENT_ID_ATTEMPTS = 3
+
+
 class AppointmentService: 
     def __init__(self, db: AsyncSession = Depends(get_db)):
         self.db = db 
 
 
-    async def query_appointment_by_appointment_id_(self, appointment_id: str) -> Appointment:
+    async def query_appointment_by_appointment_id_(self, appointment_id: str, *options) -> Appointment:
+        # doctor and patient are only filtered on (EXISTS), not loaded
         query = (
             select(Appointment)
-            .options(
-                selectinload(
-                    Appointment.doctor,
-                    Appointment.patient
-                )
-            )
+            .options(*options)
             .where(
                 and_(
                     Appointment.appointment_id == appointment_id,
-                    Appointment.patient.status == True,
-                    Appointment.doctor.status == True
+                    Appointment.patient.has(Patient.status == True),
+                    Appointment.doctor.has(Doctor.status == True)
                 )
             )
         )
@@ -57,23 +70,20 @@ class AppointmentService:
         return appointment
     
 
-    async def query_appointment_by_patient_and_doctor_id_(self, doctor_id: str, patient_id: str)-> Appointment:
+    async def query_appointment_by_patient_and_doctor_id_(self, doctor_id: str, patient_id: str, *options)-> Appointment:
         query = (
             select(Appointment)
-            .options(
-                selectinload(
-                    Appointment.doctor,
-                    Appointment.patient
-                )
-            )
+            .options(*options)
             .where(
                 and_(
                     Appointment.doctor_id == doctor_id,
                     Appointment.patient_id == patient_id,
-                    Appointment.doctor.status == True,
-                    Appointment.patient.status == True
+                    Appointment.doctor.has(Doctor.status == True),
+                    Appointment.patient.has(Patient.status == True)
                 )
             )
+            # cancelled bookings can be rebooked, prefer the active row
+            .order_by(Appointment.status == "cancel", Appointment.date.desc())
         )
 
         result = await self.db.execute(query)
@@ -82,24 +92,46 @@ class AppointmentService:
         return appointment
     
 
-    async def get_all_appointment(self) -> list[dict]:
-        query = select(Appointment)
+    async def get_all_appointment(self, limit: int, after: str | None = None, include_total: bool = False) -> dict:
+        query = keyset(
+            select(
+                Appointment.appointment_id,
+                Appointment.doctor_id,
+                Appointment.patient_id,
+                Appointment.visit_type,
+                Appointment.date,
+                Appointment.status,
+                Appointment.shift
+            ),
+            columns=[Appointment.date, Appointment.appointment_id],
+            limit=limit,
+            after=after
+        )
 
         result = await self.db.execute(query)
-        appointments = result.scalars().all()
+        appointments, next_cursor = split_page(
+            result.all(),
+            limit=limit,
+            key=lambda appointment: (appointment.date, appointment.appointment_id)
+        )
 
         summary_list = [
             {
                 "appointment_id": appointment.appointment_id,
-                "patient_id": appointment.patient_id,
                 "doctor_id": appointment.doctor_id,
-                "status": appointment.status,
+                "patient_id": appointment.patient_id,
+                "visit_type": appointment.visit_type,
                 "date": appointment.date,
+                "status": appointment.status,
                 "shift": appointment.shift
             } for appointment in appointments
         ]
 
-        return summary_list
+        return {
+            "items": summary_list,
+            "next_cursor": next_cursor,
+            "approximate_total": await approximate_total(self.db, Appointment) if include_total else None
+        }
 
     
     async def get_appointment_by_appointment_id_(self, appointment_id: str)-> AppointmentResponse:
@@ -127,7 +159,11 @@ class AppointmentService:
     
     
     async def delete_appointment_by_appointment_id_(self, appointment_id: str):
-        appointment = await self.query_appointment_by_appointment_id_(appointment_id=appointment_id)
+        # the treatment is deleted with the appointment (ORM cascade), load it up front
+        appointment = await self.query_appointment_by_appointment_id_(
+            appointment_id,
+            selectinload(Appointment.treatment)
+        )
         
         if not appointment:
             raise HTTPException(
@@ -137,7 +173,9 @@ class AppointmentService:
         
         try:
             await self.db.delete(appointment)
+            await bump_table_version(self.db, "appointment", "doctor_availability")
             await self.db.commit()
+            cache.invalidate_scope("patient_history", appointment.patient_id)
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
@@ -149,7 +187,11 @@ class AppointmentService:
     
 
     async def delete_appointment_by_patient_and_doctor_id_(self, doctor_id: str, patient_id: str):
-        appointment = await self.query_appointment_by_patient_and_doctor_id_(doctor_id=doctor_id, patient_id=patient_id)
+        appointment = await self.query_appointment_by_patient_and_doctor_id_(
+            doctor_id,
+            patient_id,
+            selectinload(Appointment.treatment)
+        )
 
         if not appointment: 
             raise HTTPException(
@@ -159,7 +201,9 @@ class AppointmentService:
         
         try:
             await self.db.delete(appointment)
+            await bump_table_version(self.db, "appointment", "doctor_availability")
             await self.db.commit()
+            cache.invalidate_scope("patient_history", appointment.patient_id)
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
@@ -171,111 +215,252 @@ class AppointmentService:
     
 
     async def create_appointment_(self, payload: AppointmentBase):
-        valid_date = validate_date_format(payload.date)
+        """
+        Book in a single INSERT. The database enforces the rules atomically:
+        the appointment_reserve_slot trigger takes a slot of an available
+        shift (or aborts), and uq_appointment_active_booking rejects a second
+        active booking of the same patient, doctor, day and shift.
+        """
+        for _attempt in range(APPOINTMENT_ID_ATTEMPTS):
+            appointment_id: str = generate_new_appointment_id(
+                patient_id=payload.patient_id, 
+                doctor_id=payload.doctor_id,
+                shift=payload.shift,
+                date=payload.date
+            )
 
-        query = (
-            select(Appointment)
-            .options(
-                selectinload(
-                    Appointment.doctor,
-                    Appointment.patient
+            try:
+                await self.db.execute(
+                    insert(Appointment).values(
+                        appointment_id = appointment_id,
+                        patient_id = payload.patient_id,
+                        doctor_id = payload.doctor_id,
+                        visit_type = payload.visit_type,
+                        date = payload.date,
+                        shift = payload.shift,
+                        status = "Booked",
+                        reason = payload.reason
+                    )
                 )
-            )
-            .where(
-                and_(
-                    Appointment.patient_id == payload.patient_id,
-                    Appointment.doctor_id == payload.doctor_id,
-                    Appointment.date == valid_date,
-                    Appointment.shift == payload.shift,
-                    Appointment.visit_type == payload.visit_type
+                await bump_table_version(self.db, "appointment", "doctor_availability")
+                await self.db.commit()
+            except IntegrityError as e:
+                await self.db.rollback()
+
+                conflict = booking_conflict(e)
+                if conflict == "appointment_id":
+                    continue
+                if conflict is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail=str(e)
+                    )
+
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND if conflict == "not_found" else status.HTTP_409_CONFLICT,
+                    detail=booking_conflict_detail(conflict, payload)
+                )
+            except Exception as e:
+                await self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=str(e)
                 )
-            )
-        )
 
-        result = await self.db.execute(query)
-        existing_appointment = result.scalars().first()
+            return {
+                "message": "Appointment created",
+                "appointment_id": appointment_id,
+            }
 
-        if existing_appointment:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Appointment with patient id: {payload.patient_id} for doctor id: {payload.doctor_id} at date: {payload.date} already exists!"
-            )
-        
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Could not allocate a unique appointment id, please retry"
+        )
+    
 
-        query_doctor_availability = (
-            select(DoctorAvailability)
+    async def create_appointments_bulk_(self, payload: AppointmentBulkCreate):
+        """
+        Book a batch with set-based validation: one query for the availability
+        rows and one for the existing bookings of every (doctor, date) in the
+        batch, then a single executemany INSERT in one transaction.
+
+        Unknown patient and doctor ids are rejected up front as well. The
+        database rules of `create_appointment_` still apply. If a concurrent
+        booking makes the batch insert fail, the valid items are retried one
+        by one so every item still gets its own result.
+        """
+        items = payload.appointments
+        doctor_ids = {item.doctor_id for item in items}
+        patient_ids = {item.patient_id for item in items}
+        dates = {item.date for item in items}
+
+        # unknown ids would fail the whole batch insert (foreign keys) and
+        # push it onto the row by row fallback, reject them up front
+        known_doctor_ids = set((await self.db.execute(
+            select(Doctor.doctor_id).where(Doctor.doctor_id.in_(doctor_ids))
+        )).scalars().all())
+        known_patient_ids = set((await self.db.execute(
+            select(Patient.patient_id).where(Patient.patient_id.in_(patient_ids))
+        )).scalars().all())
+
+        # IN x IN seeks the (doctor_id, date) indexes, the superset is filtered below
+        availability_result = await self.db.execute(
+            select(
+                DoctorAvailability.doctor_id,
+                DoctorAvailability.date,
+                DoctorAvailability.morning_available,
+                DoctorAvailability.evening_available,
+                DoctorAvailability.morning_slots,
+                DoctorAvailability.evening_slots
+            )
             .where(
-                DoctorAvailability.doctor_id == payload.doctor_id,
-                DoctorAvailability.date == valid_date
+                DoctorAvailability.doctor_id.in_(doctor_ids),
+                DoctorAvailability.date.in_(dates)
             )
         )
 
-        result_doctor_availability = await self.db.execute(query_doctor_availability)
-        doctor_availability = result_doctor_availability.scalars().first()
-
-        if not doctor_availability:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Doctor is not avaliable on: {valid_date}"
+        free_slots: dict[tuple, int] = {}
+        for row in availability_result.all():
+            free_slots[(row.doctor_id, row.date, "Morning")] = row.morning_slots if row.morning_available else 0
+            free_slots[(row.doctor_id, row.date, "Evening")] = row.evening_slots if row.evening_available else 0
+
+        booked_result = await self.db.execute(
+            select(
+                Appointment.patient_id,
+                Appointment.doctor_id,
+                Appointment.date,
+                Appointment.shift
             )
-        
-
-        is_available: str | None = None 
-        if payload.shift == "Morning" and doctor_availability.morning_available:
-            is_available = "Morning"
-        elif payload.shift == "Evening" and doctor_availability.evening_available:
-            is_available = "Evening"
-
-        if not is_available:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"doctor is not available at asked shift !"
+            .where(
+                Appointment.doctor_id.in_(doctor_ids),
+                Appointment.date.in_(dates),
+                Appointment.status != "cancel"
             )
-
-        appointment_id: str = generate_new_appointment_id(
-            patient_id=payload.patient_id, 
-            doctor_id=payload.doctor_id,
-            shift=payload.shift,
-            date=valid_date
-        )
-
-        new_appointment = Appointment(
-            appointment_id = appointment_id,
-            patient_id = payload.patient_id,
-            doctor_id = payload.doctor_id,
-            visit_type = payload.visit_type,
-            date = valid_date,
-            shift = payload.shift,
-            status = "Booked",
-            reason = payload.reason
         )
+        booked = {tuple(row) for row in booked_result.all()}
+
+        results: list[dict] = []
+        rows: list[dict] = []
+        appointment_ids: set[str] = set()
+
+        for index, item in enumerate(items):
+            booking_key = (item.patient_id, item.doctor_id, item.date, item.shift)
+            slot_key = (item.doctor_id, item.date, item.shift)
+
+            if item.shift not in {"Morning", "Evening"}:
+                results.append({"index": index, "status": "invalid", "detail": "shift must be Morning or Evening"})
+                continue
+
+            if item.patient_id not in known_patient_ids or item.doctor_id not in known_doctor_ids:
+                results.append({"index": index, "status": "invalid", "detail": booking_conflict_detail("not_found", item)})
+                continue
+
+            if booking_key in booked:
+                results.append({"index": index, "status": "conflict", "detail": booking_conflict_detail("duplicate", item)})
+                continue
+
+            if free_slots.get(slot_key, 0) <= 0:
+                results.append({"index": index, "status": "conflict", "detail": booking_conflict_detail("shift_unavailable", item)})
+                continue
+
+            # ids only vary in one character, same bound as create_appointment_
+            for _attempt in range(APPOINTMENT_ID_ATTEMPTS):
+                appointment_id = generate_new_appointment_id(
+                    patient_id=item.patient_id,
+                    doctor_id=item.doctor_id,
+                    shift=item.shift,
+                    date=item.date
+                )
+                if appointment_id not in appointment_ids:
+                    break
+            else:
+                results.append({"index": index, "status": "conflict", "detail": "Could not allocate a unique appointment id, please retry"})
+                continue
+
+            appointment_ids.add(appointment_id)
+            booked.add(booking_key)
+            free_slots[slot_key] -= 1
+
+            rows.append({
+                "appointment_id": appointment_id,
+                "patient_id": item.patient_id,
+                "doctor_id": item.doctor_id,
+                "visit_type": item.visit_type,
+                "date": item.date,
+                "shift": item.shift,
+                "status": "Booked",
+                "reason": item.reason
+            })
+            results.append({"index": index, "status": "created", "appointment_id": appointment_id})
+
+        if rows:
+            try:
+                await self.db.execute(insert(Appointment), rows)
+                await bump_table_version(self.db, "appointment", "doctor_availability")
+                await self.db.commit()
+            except IntegrityError:
+                await self.db.rollback()
+                await self._insert_one_by_one(rows, results, items)
+            except Exception as e:
+                await self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=str(e)
+                )
 
-        self.db.add(new_appointment)
-        try:
-            await self.db.commit()
-            await self.db.refresh(new_appointment)
-        except Exception as e:
-            await self.db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=str(e)
-            )
-        
+        created = sum(1 for result in results if result["status"] == "created")
         return {
-            "message": "Appointment created",
-            "appointment_id": appointment_id,
+            "created": created,
+            "failed": len(results) - created,
+            "results": results
         }
+
+
+    async def _insert_one_by_one(self, rows: list[dict], results: list[dict], items: list):
+        by_id = {result.get("appointment_id"): result for result in results if result["status"] == "created"}
+
+        for row in rows:
+            result = by_id[row["appointment_id"]]
+            item = items[result["index"]]
+
+            for _attempt in range(APPOINTMENT_ID_ATTEMPTS):
+                try:
+                    await self.db.execute(insert(Appointment).values(**row))
+                    await bump_table_version(self.db, "appointment", "doctor_availability")
+                    await self.db.commit()
+                    result["appointment_id"] = row["appointment_id"]
+                    break
+                except IntegrityError as e:
+                    await self.db.rollback()
+
+                    conflict = booking_conflict(e)
+                    if conflict is None:
+                        raise HTTPException(
+                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=str(e)
+                        )
+                    if conflict == "appointment_id":
+                        row["appointment_id"] = generate_new_appointment_id(
+                            patient_id=row["patient_id"],
+                            doctor_id=row["doctor_id"],
+                            shift=row["shift"],
+                            date=row["date"]
+                        )
+                        continue
+
+                    result.update(
+                        status="invalid" if conflict == "not_found" else "conflict",
+                        appointment_id=None,
+                        detail=booking_conflict_detail(conflict, item)
+                    )
+                    break
+            else:
+                result.update(status="conflict", appointment_id=None, detail="Could not allocate a unique appointment id, please retry")
     
 
     async def update_status_(self, patient_id: str, doctor_id: str, date: datetime.datetime, shift: str, appointment_status: str):
         query = (
             select(Appointment)
-            .options(
-                selectinload(
-                    Appointment.doctor,
-                    Appointment.patient
-                )
-            )
             .where(
                 and_(
                     Appointment.doctor_id == doctor_id,
@@ -284,6 +469,8 @@ class AppointmentService:
                     Appointment.shift == shift
                 )
             )
+            # at most one active row, any number of cancelled ones before it
+            .order_by(Appointment.status == "cancel")
         )
 
         result = await self.db.execute(query)
@@ -300,11 +487,20 @@ class AppointmentService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid appointment status"
             )
+
+        if appointment.status == "cancel":
+            # its slot is released and the booking may have been taken again
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Appointment is cancelled, book a new one"
+            )
         
         appointment.status = appointment_status
 
         try:
+            await bump_table_version(self.db, "appointment", "doctor_availability")
             await self.db.commit()
+            cache.invalidate_scope("patient_history", patient_id)
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
@@ -0,0 +1,110 @@
+"""
+Rolling availability horizon.
+
+Keeps `AVAILABILITY_HORIZON_WEEKS` weeks of `doctor_availability` rows
+materialized, starting at the Monday of the current week. Only the
+(doctor, date) pairs of the window that have no row yet are generated, so
+gaps left by deleted days are refilled and rows written ahead of the
+horizon (e.g. by the bulk availability upsert) do not hide the days before
+them. The missing pairs are found and inserted by a single
+`INSERT ... SELECT` inside SQLite: the window is checked with index probes
+and only the new rows are written, nothing is loaded into Python. With
+`ON CONFLICT DO NOTHING` a concurrent or repeated run is a no-op.
+
+Callers own the transaction (commit after calling).
+"""
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import Date, delete, func, literal, true
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..core.config import settings
+from ..database.model import (
+    Doctor,
+    DoctorAvailability
+)
+from .table_version import bump_table_version
+
+
+def horizon_window(today: Optional[date] = None, weeks: int = settings.AVAILABILITY_HORIZON_WEEKS) -> tuple[date, date]:
+    """First and last day (inclusive) of the materialized horizon."""
+    today = today or date.today()
+    start_of_week = today - timedelta(days=today.weekday())
+    return start_of_week, start_of_week + timedelta(days=7 * weeks - 1)
+
+
+async def extend_availability_horizon(
+    db: AsyncSession,
+    doctor_ids: Optional[Iterable[str]] = None,
+    today: Optional[date] = None,
+    weeks: int = settings.AVAILABILITY_HORIZON_WEEKS
+) -> int:
+    """
+    Insert the missing days up to the end of the horizon for `doctor_ids`
+    (every active doctor when omitted). Returns the number of new rows,
+    the cost beyond the index probes scales with that number.
+    """
+    start, end = horizon_window(today, weeks)
+
+    if doctor_ids is None:
+        doctors = Doctor.status == True
+    else:
+        doctors = Doctor.doctor_id.in_(set(doctor_ids))
+
+    # every day of the window, generated by SQLite instead of shipped in. The
+    # CTE stays nested in a subquery: a statement starting with WITH gets no
+    # rowcount from the sqlite3 driver
+    horizon_day = select(literal(start, Date).label("day")).cte("horizon_day", recursive=True, nesting=True)
+    horizon_day = horizon_day.union_all(
+        select(func.date(horizon_day.c.day, "+1 day")).where(horizon_day.c.day < end)
+    )
+    horizon_day = select(horizon_day.c.day).subquery("window_day")
+    existing = (
+        select(DoctorAvailability.availability_id)
+        .where(
+            DoctorAvailability.doctor_id == Doctor.doctor_id,
+            DoctorAvailability.date == horizon_day.c.day
+        )
+    )
+    # (doctor, day) pairs without a row, probed through the (doctor_id, date) index
+    missing = (
+        select(
+            Doctor.doctor_id,
+            horizon_day.c.day,
+            literal(False),
+            literal(False)
+        )
+        .select_from(Doctor)
+        # every doctor x every day, on purpose
+        .join(horizon_day, true())
+        .where(doctors, ~existing.exists())
+    )
+
+    statement = insert(DoctorAvailability).from_select(
+        ["doctor_id", "date", "morning_available", "evening_available"],
+        missing
+    ).on_conflict_do_nothing(
+        index_elements=[DoctorAvailability.doctor_id, DoctorAvailability.date]
+    )
+    # Core execute on the session's connection, an ORM insert reports no rowcount
+    connection = await db.connection()
+    result = await connection.execute(statement)
+
+    created = result.rowcount
+    if created:
+        await bump_table_version(db, "doctor_availability")
+    return created
+
+
+async def prune_past_availability(db: AsyncSession, today: Optional[date] = None) -> int:
+    """Delete the rows before the start of the current week."""
+    start, _end = horizon_window(today)
+    result = await db.execute(
+        delete(DoctorAvailability).where(DoctorAvailability.date < start)
+    )
+    if result.rowcount:
+        await bump_table_version(db, "doctor_availability")
+    return result.rowcount
@@ -6,14 +6,27 @@ from fastapi import (
 
 from sqlalchemy.ext.asyncio import AsyncSession 
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload, undefer
+from ..core.cache import cache
 from ..database.session import get_db
 
-from ..database.model import Department 
+from ..database.model import (
+    Appointment,
+    Department,
+    Doctor
+)
+from .pagination import (
+    keyset,
+    split_page,
+    approximate_total
+)
 from ..database.api_models.department_model import (
     DepartmentCreate,
     DepartmentResponse,
     DepatemtntUpdate
 )
+from .doctor_service import release_doctor_references
+from .table_version import bump_table_version, cached_by_table_version
 
 
 class DepartmentService:
@@ -41,8 +54,11 @@ class DepartmentService:
         self.db.add(new_department)
         
         try:
+            await bump_table_version(self.db, "department")
             await self.db.commit()
             await self.db.refresh(new_department)
+            # doctor summaries carry the department name
+            cache.invalidate("departments", "doctors")
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
@@ -53,11 +69,27 @@ class DepartmentService:
         return {"message": f"Department {payload.department_id} Create succfully"}
     
 
-    async def get_all_department_(self):
-        query = select(Department)
+    @cached_by_table_version("departments", "department")
+    async def get_all_department_(self, limit: int, after: str | None = None, include_total: bool = False):
+        query = keyset(
+            select(
+                Department.department_id,
+                Department.department_name,
+                Department.location,
+                Department.description,
+                Department.head_of_department
+            ),
+            columns=[Department.department_id],
+            limit=limit,
+            after=after
+        )
 
         result = await self.db.execute(query)
-        departments = result.scalars().all()
+        departments, next_cursor = split_page(
+            result.all(),
+            limit=limit,
+            key=lambda dep: (dep.department_id,)
+        )
 
         summary_list = [
             {
@@ -69,12 +101,17 @@ class DepartmentService:
             } for dep in departments
         ]
         
-        return summary_list
+        return {
+            "items": summary_list,
+            "next_cursor": next_cursor,
+            "approximate_total": await approximate_total(self.db, Department) if include_total else None
+        }
 
 
     async def get_department(self, department_id: str):
         query = (
             select(Department).
+            options(undefer(Department.description)).
             where(Department.department_id == department_id)
         )
 
@@ -109,12 +146,30 @@ class DepartmentService:
         for key, value in update_data.items():
             setattr(department, key, value)
 
+        try:
+            # doctor summaries carry the department name
+            await bump_table_version(self.db, "department", "doctor")
+            await self.db.commit()
+            cache.invalidate("departments", "doctors")
+        except Exception as e:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
+            )
+
         return {"message": f"department with department id: {department_id} updated !"}
     
 
     async def delete_department_(self, department_id: str):
+        # doctors, their appointments and treatments are deleted with it (ORM cascade)
         query = (
             select(Department).
+            options(
+                selectinload(Department.doctors)
+                .selectinload(Doctor.appointments)
+                .selectinload(Appointment.treatment)
+            ).
             where(Department.department_id == department_id)
         )
 
@@ -128,7 +183,12 @@ class DepartmentService:
             )
         
         try: 
+            await release_doctor_references(self.db, [doctor.doctor_id for doctor in department.doctors])
             await self.db.delete(department)
+            # the doctors' appointments and availability days go with it
+            await bump_table_version(self.db, "department", "doctor", "appointment", "doctor_availability")
+            await self.db.commit()
+            cache.invalidate("departments", "doctors", "patient_history")
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
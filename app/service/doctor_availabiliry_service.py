@@ -8,7 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select 
 from sqlalchemy.orm import selectinload
 from sqlalchemy import and_
+from sqlalchemy.dialects.sqlite import insert
 
+from ..core.config import settings
 from ..database.session import get_db
 from ..database.model import (
     Doctor,
@@ -17,10 +19,12 @@ from ..database.model import (
 
 from ..database.api_models.doctor_availability_model import (
     DoctorAvailabilityUpdate,
-    DoctorAvailabilityResponse
+    DoctorAvailabilityResponse,
+    DoctorAvailabilityBulkUpdate
 )
 
-# from .helper import generate_new_doctor_availability
+from .availability_horizon import extend_availability_horizon
+from .table_version import bump_table_version
 
 from datetime import date, timedelta, datetime
 
@@ -51,7 +55,9 @@ class DoctorAvailabilityService:
             {
                 "date": availability.date,
                 "morning_available": availability.morning_available,
-                "evening_available": availability.evening_available
+                "evening_available": availability.evening_available,
+                "morning_slots": availability.morning_slots,
+                "evening_slots": availability.evening_slots
             } for availability in availabilites
         ]
 
@@ -59,46 +65,16 @@ class DoctorAvailabilityService:
 
 
     async def create_availability_for_week(self, doctor_id: str):
-
-        today_date = date.today()
-        start_of_week = today_date - timedelta(days=today_date.weekday())
-        # end_of_week = start_of_week + timedelta(days=6)
-
-        avalibility_list: list[DoctorAvailability] = []
-        
-        for i in range(7):
-            # availability_id  = generate_new_doctor_availability(doctor_id=doctor_id, iter=i)
-            current_date = start_of_week + timedelta(days=i)
-
-            query = (
-                select(DoctorAvailability).
-                where(
-                    and_(
-                        DoctorAvailability.doctor_id == doctor_id,
-                        DoctorAvailability.date == current_date
-                    )
-                )
-            )
-
-            result = await self.db.execute(query)
-            existing_date = result.scalars().first()
-
-            if existing_date:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Avalibility already exists"
-                )
-            
-            new_avalibility = DoctorAvailability(
-                doctor_id = doctor_id,
-                date = current_date,
-                morning_available = False,
-                evening_available = False
+        result = await self.db.execute(select(Doctor.doctor_id).where(Doctor.doctor_id == doctor_id))
+        if result.scalar() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No doctor with doctor id: {doctor_id} found !"
             )
 
-            avalibility_list.append(new_avalibility)
+        # idempotent, only the days missing from the horizon are inserted
+        created = await extend_availability_horizon(self.db, doctor_ids=[doctor_id])
 
-        self.db.add_all(avalibility_list)
         try: 
             await self.db.commit()
         except Exception as e:
@@ -108,7 +84,10 @@ class DoctorAvailabilityService:
                 detail=str(e)
             )
 
-        return {"message": f"Availability added for doctor id: {doctor_id}"}
+        return {
+            "message": f"Availability added for doctor id: {doctor_id}",
+            "created": created
+        }
             
     
     async def update_availability(self,doctor_id: str, date: datetime,payload: DoctorAvailabilityUpdate):
@@ -134,7 +113,13 @@ class DoctorAvailabilityService:
         availability.morning_available = payload.morning_available 
         availability.evening_available = payload.evening_available 
 
+        if payload.morning_slots is not None:
+            availability.morning_slots = payload.morning_slots
+        if payload.evening_slots is not None:
+            availability.evening_slots = payload.evening_slots
+
         try:
+            await bump_table_version(self.db, "doctor_availability")
             await self.db.commit()
             await self.db.refresh(availability)
         except Exception as e:
@@ -147,6 +132,146 @@ class DoctorAvailabilityService:
         return {"message": f"availability update for doctor id: {doctor_id} for date: {date}"}
     
 
+    async def update_availability_bulk(self, payload: DoctorAvailabilityBulkUpdate):
+        """
+        Apply a matrix of (doctor, date) changes in one transaction: one query
+        for the current rows, one for the doctors, then an executemany upsert
+        on (doctor_id, date) for the rows that actually change.
+
+        The read is not isolated from the write (pysqlite only begins the
+        transaction at the first write), so the upsert only SETs the slot
+        columns a change supplies. A booking that takes a slot in between is
+        never overwritten by a stale read. The diff is computed from that
+        read and lists only the supplied fields of existing rows.
+        """
+        changes = payload.changes
+
+        keys = [(change.doctor_id, change.date) for change in changes]
+        if len(set(keys)) != len(keys):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Each (doctor_id, date) may only appear once per request"
+            )
+
+        doctor_ids = {change.doctor_id for change in changes}
+        dates = {change.date for change in changes}
+
+        doctors_result = await self.db.execute(
+            select(Doctor.doctor_id).where(Doctor.doctor_id.in_(doctor_ids))
+        )
+        known_doctors = set(doctors_result.scalars().all())
+
+        # IN x IN seeks the (doctor_id, date) index, the superset is filtered by key below
+        existing_result = await self.db.execute(
+            select(
+                DoctorAvailability.doctor_id,
+                DoctorAvailability.date,
+                DoctorAvailability.morning_available,
+                DoctorAvailability.evening_available,
+                DoctorAvailability.morning_slots,
+                DoctorAvailability.evening_slots
+            )
+            .where(
+                DoctorAvailability.doctor_id.in_(doctor_ids),
+                DoctorAvailability.date.in_(dates)
+            )
+        )
+        existing = {(row.doctor_id, row.date): row._asdict() for row in existing_result.all()}
+
+        # supplied slot columns -> upsert rows
+        rows_by_slots: dict[tuple, list[dict]] = {}
+        diff: list[dict] = []
+        errors: list[dict] = []
+        unchanged = 0
+
+        for change in changes:
+            if change.doctor_id not in known_doctors:
+                errors.append({
+                    "doctor_id": change.doctor_id,
+                    "date": change.date,
+                    "detail": f"Doctor with id: {change.doctor_id} not found"
+                })
+                continue
+
+            current = existing.get((change.doctor_id, change.date))
+
+            target = {
+                "morning_available": change.morning_available,
+                "evening_available": change.evening_available
+            }
+            # omitted slot counts are left to the database (capacity for new days)
+            supplied = tuple(
+                shift for shift in ("morning_slots", "evening_slots")
+                if getattr(change, shift) is not None
+            )
+            for shift in supplied:
+                target[shift] = getattr(change, shift)
+
+            compared = target if current else {
+                **target,
+                "morning_slots": target.get("morning_slots", settings.SHIFT_CAPACITY),
+                "evening_slots": target.get("evening_slots", settings.SHIFT_CAPACITY)
+            }
+            changed = {
+                field: [current[field] if current else None, value]
+                for field, value in compared.items()
+                if not current or current[field] != value
+            }
+
+            if not changed:
+                unchanged += 1
+                continue
+
+            rows_by_slots.setdefault(supplied, []).append({
+                "doctor_id": change.doctor_id,
+                "date": change.date,
+                "morning_slots": settings.SHIFT_CAPACITY,
+                "evening_slots": settings.SHIFT_CAPACITY,
+                **target
+            })
+            diff.append({
+                "doctor_id": change.doctor_id,
+                "date": change.date,
+                "action": "updated" if current else "created",
+                "fields": changed
+            })
+
+        if rows_by_slots:
+            try:
+                # one upsert per combination of supplied slot columns
+                for supplied, rows in rows_by_slots.items():
+                    statement = insert(DoctorAvailability)
+                    statement = statement.on_conflict_do_update(
+                        index_elements=[DoctorAvailability.doctor_id, DoctorAvailability.date],
+                        set_={
+                            field: statement.excluded[field]
+                            for field in ("morning_available", "evening_available", *supplied)
+                        }
+                    )
+                    await self.db.execute(statement, rows)
+
+                await bump_table_version(self.db, "doctor_availability")
+                await self.db.commit()
+            except Exception as e:
+                await self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=str(e)
+                )
+        else:
+            # close the read transaction
+            await self.db.rollback()
+
+        created = sum(1 for entry in diff if entry["action"] == "created")
+        return {
+            "created": created,
+            "updated": len(diff) - created,
+            "unchanged": unchanged,
+            "diff": diff,
+            "errors": errors
+        }
+
+
     async def delete_availabilites(self, doctor_id: str):
         query = (
             select(DoctorAvailability)
@@ -168,6 +293,7 @@ class DoctorAvailabilityService:
             await self.db.delete(availability)
 
         try:
+            await bump_table_version(self.db, "doctor_availability")
             await self.db.commit()
         except Exception as e:
             await self.db.rollback()
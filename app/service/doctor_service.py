@@ -4,13 +4,18 @@ from fastapi import (
     status
 )
 
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
+from ..core.cache import cache
 from ..database.session import get_db
 from ..database.model import (
-    Doctor
+    Appointment,
+    Doctor,
+    DoctorAvailability,
+    Department
 )
 
 from ..database.api_models.doctor_model import (
@@ -24,6 +29,52 @@ from .helper import (
     generate_new_doctor_email,
     generate_new_doctor_password
 )
+from .pagination import (
+    keyset,
+    split_page,
+    approximate_total
+)
+from .table_version import bump_table_version, cached_by_table_version
+
+
+async def release_doctor_references(db: AsyncSession, doctor_ids: list[str]):
+    """
+    Drop the rows pointing at doctors about to be deleted that the ORM does
+    not cascade: their availability days and any head_of_department link.
+    These foreign keys have no ON DELETE action, so with foreign_keys=ON
+    (production profile) the doctor delete would fail otherwise.
+    """
+    await db.execute(
+        update(Department)
+        .where(Department.head_of_department.in_(doctor_ids))
+        .values(head_of_department=None)
+    )
+    await db.execute(
+        delete(DoctorAvailability).where(DoctorAvailability.doctor_id.in_(doctor_ids))
+    )
+
+
+def _summary_query():
+    # only the DoctorSummary columns, as plain rows instead of ORM objects
+    return (
+        select(
+            Doctor.doctor_id,
+            Doctor.doctor_name,
+            Doctor.phone_no,
+            Department.department_name
+        )
+        .outerjoin(Department, Department.department_id == Doctor.department_id)
+    )
+
+
+def _summary(row) -> dict:
+    return {
+        "doctor_id": row.doctor_id,
+        "doctor_name": row.doctor_name,
+        "department_name": row.department_name if row.department_name is not None else "Null",
+        "phone_no": str(row.phone_no)
+    }
+
 
 class DoctorService:
     def __init__(self, db: AsyncSession = Depends(get_db)):
@@ -60,12 +111,14 @@ class DoctorService:
             status = payload.status
         )
 
-        new_doctor.set_password(doctor_password)
+        await new_doctor.set_password_async(doctor_password)
 
         self.db.add(new_doctor)
         try:
+            await bump_table_version(self.db, "doctor")
             await self.db.commit()
             await self.db.refresh(new_doctor)
+            cache.invalidate("doctors")
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
@@ -99,8 +152,10 @@ class DoctorService:
             setattr(doctor, key, value)
 
         try:
+            await bump_table_version(self.db, "doctor")
             await self.db.commit()
             await self.db.refresh(doctor)
+            cache.invalidate("doctors", "patient_history")
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
@@ -126,8 +181,10 @@ class DoctorService:
         doctor.status = doctor_status
 
         try:
+            await bump_table_version(self.db, "doctor")
             await self.db.commit()
             await self.db.refresh(doctor)
+            cache.invalidate("doctors")
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
@@ -138,15 +195,12 @@ class DoctorService:
         return {"message": f"Doctor with doctor id: {doctor_id} status changed to: {doctor_status}"}
     
 
+    @cached_by_table_version("doctors", "doctor", "department")
     async def get_doctor_(self, doctor_id: str) -> DoctorSummary:
-        query = (
-            select(Doctor)
-            .options(selectinload(Doctor.department))
-            .where(Doctor.doctor_id == doctor_id)
-        )
+        query = _summary_query().where(Doctor.doctor_id == doctor_id)
 
         result = await self.db.execute(query)
-        doctor = result.scalars().first()
+        doctor = result.first()
 
         if not doctor:
             raise HTTPException(
@@ -154,40 +208,41 @@ class DoctorService:
                 detail=f"No Doctor with doctor id: {doctor_id} found !"
             )
         
-        response = {
-            "doctor_id": doctor_id,
-            "doctor_name": doctor.doctor_name,
-            "department_name": doctor.department.department_name,
-            "phone_no": str(doctor.phone_no),
-        }
-        
-        return response
+        return _summary(doctor)
         
     
-    async def get_all_doctors_(self) -> list[dict]:
-        query = (
-            select(Doctor).
-            options(selectinload(Doctor.department))
+    @cached_by_table_version("doctors", "doctor", "department")
+    async def get_all_doctors_(self, limit: int, after: str | None = None, include_total: bool = False) -> dict:
+        query = keyset(
+            _summary_query(),
+            columns=[Doctor.doctor_id],
+            limit=limit,
+            after=after
         )
 
         result = await self.db.execute(query)
-        doctors = result.scalars().all()
+        doctors, next_cursor = split_page(
+            result.all(),
+            limit=limit,
+            key=lambda doc: (doc.doctor_id,)
+        )
 
-        summary_list = [
-            {
-                "doctor_id": doc.doctor_id,
-                "doctor_name": doc.doctor_name,
-                "phone_no": str(doc.phone_no),
-                "department_name": doc.department.department_name if doc.department else "Null"
-            } for doc in doctors
-        ]
+        summary_list = [_summary(doc) for doc in doctors]
 
-        return summary_list
+        return {
+            "items": summary_list,
+            "next_cursor": next_cursor,
+            "approximate_total": await approximate_total(self.db, Doctor) if include_total else None
+        }
 
 
     async def delete_doctor_(self, doctor_id: str):
+        # appointments and their treatments are deleted with the doctor (ORM cascade)
         query = (
             select(Doctor)
+            .options(
+                selectinload(Doctor.appointments).selectinload(Appointment.treatment)
+            )
             .where(Doctor.doctor_id == doctor_id)
             ) 
         result = await self.db.execute(query)
@@ -200,7 +255,12 @@ class DoctorService:
             )
         
         try:
+            await release_doctor_references(self.db, [doctor_id])
             await self.db.delete(doctor)
+            # the doctor's appointments are deleted with it and release their slots
+            await bump_table_version(self.db, "doctor", "appointment", "doctor_availability")
+            await self.db.commit()
+            cache.invalidate("doctors", "patient_history")
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
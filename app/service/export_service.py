@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+import zlib
+
+from typing import AsyncIterator
+
+from sqlalchemy.future import select
+
+from ..core.config import settings
+from ..database.session import AsyncReadSessionLocal
+from ..database.model import (
+    Appointment,
+    Patient,
+    Treatment
+)
+
+from ..database.api_models.export_model import (
+    ExportFormat,
+    ExportTable
+)
+
+
+# exported columns per table, first column is the (stable) sort key
+EXPORT_COLUMNS = {
+    ExportTable.appointment: [
+        Appointment.appointment_id,
+        Appointment.patient_id,
+        Appointment.doctor_id,
+        Appointment.visit_type,
+        Appointment.date,
+        Appointment.shift,
+        Appointment.status,
+        Appointment.reason,
+    ],
+    ExportTable.patient: [
+        Patient.patient_id,
+        Patient.patient_name,
+        Patient.email,
+        Patient.gender,
+        Patient.phone_no,
+        Patient.emergency_contact,
+        Patient.date_of_birth,
+        Patient.address,
+        Patient.status,
+        Patient.medical_history,
+    ],
+    ExportTable.treatment: [
+        Treatment.treatment_id,
+        Treatment.appointment_id,
+        Treatment.test_done,
+        Treatment.diagonsis,
+        Treatment.prescription,
+        Treatment.follow_up_date,
+    ],
+}
+
+
+class ExportService:
+    """
+    Streams whole tables as NDJSON or CSV.
+
+    Unlike the other services this one does not take a request scoped
+    session: FastAPI closes `get_db` before a `StreamingResponse` body is
+    sent, so every export opens its own read-only session for the lifetime
+    of the stream.
+    """
+
+    def media_type(self, export_format: ExportFormat, compress: bool) -> str:
+        if compress:
+            return "application/gzip"
+        if export_format == ExportFormat.csv:
+            return "text/csv"
+        return "application/x-ndjson"
+
+
+    def filename(self, table: ExportTable, export_format: ExportFormat, compress: bool) -> str:
+        return f"{table.value}.{export_format.value}" + (".gz" if compress else "")
+
+
+    async def stream_(self, table: ExportTable, export_format: ExportFormat, compress: bool = False) -> AsyncIterator[bytes]:
+        chunks = self._encode(table=table, export_format=export_format)
+
+        if not compress:
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        # wbits=31 -> gzip container
+        compressor = zlib.compressobj(wbits=31)
+        async for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+
+    async def _rows(self, table: ExportTable) -> AsyncIterator[list]:
+        columns = EXPORT_COLUMNS[table]
+        query = (
+            select(*columns)
+            .order_by(columns[0])
+            .execution_options(yield_per=settings.EXPORT_CHUNK_ROWS)
+        )
+
+        async with AsyncReadSessionLocal() as db:
+            result = await db.stream(query)
+            async for partition in result.partitions():
+                yield partition
+
+
+    async def _encode(self, table: ExportTable, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        names = [column.key for column in EXPORT_COLUMNS[table]]
+
+        if export_format == ExportFormat.csv:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+
+            writer.writerow(names)
+            async for partition in self._rows(table):
+                writer.writerows(partition)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+
+            tail = buffer.getvalue()
+            if tail:
+                yield tail.encode()
+            return
+
+        async for partition in self._rows(table):
+            yield "".join(
+                json.dumps(dict(zip(names, row)), default=str) + "\n"
+                for row in partition
+            ).encode()
@@ -46,6 +46,37 @@ def generate_new_appointment_id(
     return appointment_id
 
 
+# SQLite names the columns of a violated unique index, not the index
+_ACTIVE_BOOKING_COLUMNS = "appointment.patient_id, appointment.doctor_id, appointment.date, appointment.shift"
+
+
+def booking_conflict(error: Exception) -> str | None:
+    """
+    Which database rule rejected an appointment insert, None for any other
+    integrity error (the caller re-raises those).
+    """
+    message = str(getattr(error, "orig", error))
+
+    if "shift_unavailable" in message:
+        return "shift_unavailable"
+    if "UNIQUE constraint failed: appointment.appointment_id" in message:
+        return "appointment_id"
+    if f"UNIQUE constraint failed: {_ACTIVE_BOOKING_COLUMNS}" in message:
+        return "duplicate"
+    # only raised with PRAGMA foreign_keys=ON
+    if "FOREIGN KEY constraint failed" in message:
+        return "not_found"
+    return None
+
+
+def booking_conflict_detail(conflict: str, payload) -> str:
+    if conflict == "shift_unavailable":
+        return f"Doctor is not available or fully booked for the {payload.shift} shift on: {payload.date}"
+    if conflict == "not_found":
+        return f"No patient with patient id: {payload.patient_id} or doctor with doctor id: {payload.doctor_id} found !"
+    return f"Appointment with patient id: {payload.patient_id} for doctor id: {payload.doctor_id} at date: {payload.date} already exists!"
+
+
 def generate_new_doctor_id()-> str:
     uid: str = str(uuid.uuid4()).split("-") 
     doctor_id: str = "DR" + str(uid[0] + uid[1])
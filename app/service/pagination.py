@@ -0,0 +1,89 @@
+import base64
+import datetime
+import json
+import time
+
+from fastapi import (
+    HTTPException,
+    status
+)
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..core.config import settings
+
+
+# table name -> (monotonic timestamp, row count)
+_total_cache: dict[str, tuple[float, int]] = {}
+
+
+def encode_cursor(values) -> str:
+    """Opaque cursor for the sort key of the last row of a page."""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime.date) else v for v in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+
+        return [
+            datetime.date.fromisoformat(value)
+            if column.type.python_type is datetime.date else value
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset(query, columns: list, limit: int, after: str | None = None, descending: bool = False):
+    """Order `query` by `columns` and seek past the row encoded in `after`.
+
+    One extra row is fetched so `split_page` can tell whether a next page exists.
+    With `descending` every column is sorted newest/largest first.
+    """
+    if after:
+        values = decode_cursor(after, columns)
+        left = columns[0] if len(columns) == 1 else tuple_(*columns)
+        right = values[0] if len(columns) == 1 else tuple_(*values)
+        query = query.where(left < right if descending else left > right)
+
+    order = [column.desc() for column in columns] if descending else columns
+    return query.order_by(*order).limit(limit + 1)
+
+
+def split_page(rows: list, limit: int, key) -> tuple[list, str | None]:
+    """Trim the look-ahead row and build the cursor for the next page."""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+async def approximate_total(db: AsyncSession, model) -> int:
+    """Row count of `model`'s table, cached for PAGE_TOTAL_CACHE_SECONDS."""
+    table_name = model.__tablename__
+    now = time.monotonic()
+
+    cached = _total_cache.get(table_name)
+    if cached and now - cached[0] < settings.PAGE_TOTAL_CACHE_SECONDS:
+        return cached[1]
+
+    result = await db.execute(select(func.count()).select_from(model))
+    total = result.scalar() or 0
+
+    _total_cache[table_name] = (now, total)
+    return total
@@ -22,9 +22,25 @@ from .helper import (
     validate_date_format,
     validate_age
 )
+from .pagination import (
+    keyset,
+    split_page,
+    approximate_total
+)
 
 import datetime
 
+
+# PatientSummary columns, selected as plain rows instead of ORM objects
+_SUMMARY_COLUMNS = (
+    Patient.patient_id,
+    Patient.patient_name,
+    Patient.email,
+    Patient.phone_no,
+    Patient.emergency_contact
+)
+
+
 class PatientService:
     def __init__(self, db: AsyncSession = Depends(get_db)):
         self.db = db 
@@ -60,7 +76,7 @@ class PatientService:
             date_of_birth = valid_dob,
             **data_dict
         )
-        new_patient.set_password(payload.password)
+        await new_patient.set_password_async(payload.password)
 
         self.db.add(new_patient)
         try:
@@ -79,11 +95,20 @@ class PatientService:
             "email": payload.email
         }
     
-    async def get_all_patient_(self)-> list[dict]:
-        query = select(Patient)
+    async def get_all_patient_(self, limit: int, after: str | None = None, include_total: bool = False)-> dict:
+        query = keyset(
+            select(*_SUMMARY_COLUMNS),
+            columns=[Patient.patient_id],
+            limit=limit,
+            after=after
+        )
 
         result = await self.db.execute(query)
-        patients = result.scalars().all()
+        patients, next_cursor = split_page(
+            result.all(),
+            limit=limit,
+            key=lambda patient: (patient.patient_id,)
+        )
 
         summary_list = [
             {"patient_id": patient.patient_id,
@@ -94,17 +119,21 @@ class PatientService:
             for patient in patients
         ]
 
-        return summary_list
+        return {
+            "items": summary_list,
+            "next_cursor": next_cursor,
+            "approximate_total": await approximate_total(self.db, Patient) if include_total else None
+        }
     
 
     async def get_patient_(self, patient_id: str):
         query = (
-            select(Patient)
+            select(*_SUMMARY_COLUMNS)
             .where(Patient.patient_id == patient_id)
         )
 
         result = await self.db.execute(query)
-        patient = result.scalars().first()
+        patient = result.first()
 
         if not patient:
             raise HTTPException(
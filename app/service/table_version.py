@@ -0,0 +1,70 @@
+"""
+Per-table change versions.
+
+Every service write calls `bump_table_version` before its commit, so the
+version changes atomically with the data. Conditional GETs (see
+`app.api.etag`) derive their ETags from these versions instead of hashing
+the response body.
+
+Cached reads behind such an ETag use `cached_by_table_version`, which puts
+the same versions into the cache key. The body and the ETag then always
+come from the same version, even when another worker made the write and
+only invalidated its own cache.
+"""
+import functools
+
+from typing import Iterable
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..core.cache import cache
+from ..database.model import TableVersion
+
+
+async def bump_table_version(db: AsyncSession, *tables: str):
+    for table in tables:
+        statement = insert(TableVersion).values(table_name=table, version=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=[TableVersion.table_name],
+            set_={"version": TableVersion.version + 1}
+        )
+        await db.execute(statement)
+
+
+async def get_table_versions(db: AsyncSession, tables: Iterable[str]) -> dict[str, int]:
+    """Current version of every table in `tables`, 0 for never written ones."""
+    tables = list(tables)
+    result = await db.execute(
+        select(TableVersion.table_name, TableVersion.version)
+        .where(TableVersion.table_name.in_(tables))
+    )
+    versions = dict(result.all())
+    return {table: versions.get(table, 0) for table in tables}
+
+
+def cached_by_table_version(namespace: str, *tables: str):
+    """
+    Like `app.core.cache.cached`, keyed on the current versions of `tables`
+    as well. The versions are read on the service's own session, before the
+    cached query, so a body is never stored under a newer version than the
+    one it was read at.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            versions = await get_table_versions(self.db, tables)
+            key = (
+                method.__name__,
+                tuple(versions[table] for table in tables),
+                args,
+                tuple(sorted(kwargs.items()))
+            )
+            return await cache.get_or_load(
+                namespace,
+                key,
+                lambda: method(self, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
@@ -6,15 +6,22 @@ from fastapi import (
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 from sqlalchemy import and_
 
+from ..core.cache import cache
 from ..database.session import get_db
 from ..database.model import (
     Appointment,
+    Doctor,
+    Patient,
     Treatment
 )
 
+from .pagination import (
+    keyset,
+    split_page
+)
+
 from ..database.api_models.appointment_treatment_model import (
     TreatmentCreate
 )
@@ -30,20 +37,14 @@ class TreatmentService:
 
         appointment_query = (
             select(Appointment)
-            .options(
-                selectinload(
-                    Appointment.doctor,
-                    Appointment.patient
-                )
-            )
             .where(
                 and_(
                     Appointment.appointment_id == appointment_id,
                     Appointment.doctor_id == payload.doctor_id,
                     Appointment.patient_id == payload.patient_id,
                     Appointment.status == "Booked",
-                    Appointment.patient.status == True,
-                    Appointment.doctor.status == True
+                    Appointment.patient.has(Patient.status == True),
+                    Appointment.doctor.has(Doctor.status == True)
                 )
             )
         )
@@ -61,7 +62,7 @@ class TreatmentService:
             treatment_id = treatment_id,
             appointment_id = appointment_id,
             test_done = payload.test_done,
-            diagnosis = payload.diagonsis,
+            diagonsis = payload.diagonsis,
             prescription = payload.prescription,
             follow_up_date = payload.follow_up_date
         )
@@ -70,6 +71,7 @@ class TreatmentService:
         try:
             await self.db.commit()
             await self.db.refresh(new_treatment)
+            cache.invalidate_scope("patient_history", payload.patient_id)
         except Exception as e:
             await self.db.rollback()
             raise HTTPException(
@@ -80,42 +82,67 @@ class TreatmentService:
         return {"message": f"Treatment for appointment : {appointment_id} created"}
     
 
-    async def get_patient_history_(self, patient_id):
-        query = (
-            select(Appointment)
-            .options(
-                selectinload(Appointment.patient),
-                selectinload(Appointment.doctor),
-                selectinload(Appointment.treatment)
+    async def get_patient_history_(self, patient_id: str, limit: int, after: str | None = None) -> dict:
+        """Completed visits newest first, cached per patient until a treatment or status change."""
+        return await cache.get_or_load(
+            "patient_history",
+            (limit, after),
+            lambda: self._load_patient_history(patient_id, limit, after),
+            scope=patient_id
+        )
+
+
+    async def _load_patient_history(self, patient_id: str, limit: int, after: str | None) -> dict:
+        query = keyset(
+            select(
+                Appointment.appointment_id,
+                Appointment.date,
+                Appointment.visit_type,
+                Appointment.doctor_id,
+                Doctor.doctor_name,
+                Treatment.test_done,
+                Treatment.diagonsis,
+                Treatment.prescription,
+                Treatment.follow_up_date
             )
+            .join(Doctor, Doctor.doctor_id == Appointment.doctor_id)
+            .outerjoin(Treatment, Treatment.appointment_id == Appointment.appointment_id)
             .where(
                 Appointment.patient_id == patient_id,
                 Appointment.status == "complete"
-            )
+            ),
+            columns=[Appointment.date, Appointment.appointment_id],
+            limit=limit,
+            after=after,
+            descending=True
         )
 
         result = await self.db.execute(query)
-        appointments = result.scalars().all()
+        visits, next_cursor = split_page(
+            result.all(),
+            limit=limit,
+            key=lambda visit: (visit.date, visit.appointment_id)
+        )
 
-        if not appointments:
+        if not visits and not after:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No appointment history found for patient id: {patient_id}"
             )
 
         return {
-            "patient_doctor_data": {
-                "patient_name": Appointment.patient.patient_name,
-                "doctor_name": Appointment.doctor.doctor_name,
-            },
-
-            "patient_history": [
+            "items": [
                 {
-                    "visit_type": appointment.visit_type,
-                    "test_done": appointment.treatment.test_done if appointment.treatment else None,
-                    "diagnosis": appointment.treatment.diagnosis if appointment.treatment else None,
-                    "prescription": appointment.treatment.prescription if appointment.treatment else None,
-                } for appointment in appointments
-            ]
+                    "appointment_id": visit.appointment_id,
+                    "date": visit.date,
+                    "visit_type": visit.visit_type,
+                    "doctor_id": visit.doctor_id,
+                    "doctor_name": visit.doctor_name,
+                    "test_done": visit.test_done,
+                    "diagnosis": visit.diagonsis,
+                    "prescription": visit.prescription,
+                    "follow_up_date": visit.follow_up_date
+                } for visit in visits
+            ],
+            "next_cursor": next_cursor
         }
-    
\ No newline at end of file
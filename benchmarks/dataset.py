@@ -0,0 +1,350 @@
+"""
+Synthetic hospital dataset for load and scale testing.
+
+    python -m benchmarks.dataset --database /tmp/hospital.sqlite3 --appointments 1000000
+
+Writes a new SQLite database at the latest schema version:
+
+* departments, each headed by one of its doctors
+* doctors with a weekly working pattern (`--days-per-week`, one or both
+  shifts per working day), materialized as `doctor_availability` rows for
+  the current availability horizon like the scheduler would
+* adult patients (18 to 90 years old, see `validate_age`)
+* appointments over `--history-days` of history and the horizon ahead,
+  only on shifts the doctor works, at most SHIFT_CAPACITY active bookings
+  per doctor, day and shift, a patient at most once in each. Doctors are picked with a
+  Zipf popularity skew (`--skew`, 0 = uniform). Past appointments are
+  "complete", "Missed" (`--no-show-rate`), "cancel" (`--cancel-rate`) or
+  still "Booked" waiting for the nightly sweep (`--pending-rate`)
+* a treatment for every completed appointment
+
+Every account gets the same password (`--password`), hashed once. The
+schema is created by the application's own `init_schema`, its indexes and
+triggers are dropped for the load (executemany in one transaction) and
+recreated afterwards, and the search index is rebuilt once at the end.
+"""
+import argparse
+import bisect
+import itertools
+import math
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.core.security import hash_password
+from app.database.bootstrap import init_schema
+from app.database.search_index import rebuild_search_index
+from app.service.availability_horizon import horizon_window
+
+
+INSERT_CHUNK = 100_000
+
+# working day -> (morning, evening), weighted
+SHIFT_PATTERNS = [(True, True), (True, False), (False, True)]
+SHIFT_PATTERN_WEIGHTS = [0.6, 0.2, 0.2]
+
+# future days are only partly booked yet
+FUTURE_BOOKING_WEIGHT = 0.4
+
+VISIT_TYPES = ["OPD", "Follow-up", "Emergency", "Consultation"]
+DIAGNOSES = ["Viral fever", "Hypertension", "Type 2 diabetes", "Migraine", "Gastritis", "Sprain", "Bronchitis"]
+PRESCRIPTIONS = ["Paracetamol 500mg", "Amlodipine 5mg", "Metformin 500mg", "Sumatriptan 50mg", "Pantoprazole 40mg", "Rest"]
+TESTS = [None, "CBC", "Blood sugar", "X-Ray", "ECG", "Lipid profile"]
+
+
+def _insert(conn, table: str, columns: tuple[str, ...], rows: list[tuple]):
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    for start in range(0, len(rows), INSERT_CHUNK):
+        conn.exec_driver_sql(statement, rows[start:start + INSERT_CHUNK])
+
+
+def _default_doctors(appointments: int, days: int, days_per_week: int) -> int:
+    # ~50% of the shift capacity used on average
+    shifts_per_doctor = days * days_per_week / 7 * 1.6
+    return max(10, math.ceil(appointments / (shifts_per_doctor * settings.SHIFT_CAPACITY * 0.5)))
+
+
+def _fill_slots(rng: random.Random, weights: list[float], total: int, capacity: int) -> list[int]:
+    """Spread `total` bookings over the slots by weight, none above `capacity`."""
+    counts = [0] * len(weights)
+    weights = list(weights)
+    remaining = total
+
+    while remaining:
+        open_slots = [index for index, weight in enumerate(weights) if weight > 0]
+        if not open_slots:
+            raise ValueError(
+                f"{total} appointments do not fit the shift capacity, add doctors or history days"
+            )
+
+        spilled = 0
+        for index in rng.choices(open_slots, weights=[weights[i] for i in open_slots], k=remaining):
+            if counts[index] < capacity:
+                counts[index] += 1
+            else:
+                spilled += 1
+                weights[index] = 0
+
+        remaining = spilled
+
+    return counts
+
+
+def generate(
+    path: Path,
+    appointments: int,
+    doctors: int | None = None,
+    patients: int | None = None,
+    departments: int = 10,
+    history_days: int = 365,
+    horizon_weeks: int = settings.AVAILABILITY_HORIZON_WEEKS,
+    days_per_week: int = 5,
+    skew: float = 1.0,
+    no_show_rate: float = 0.08,
+    cancel_rate: float = 0.1,
+    pending_rate: float = 0.02,
+    visits_per_patient: int = 8,
+    password: str = "password",
+    seed: int = 42,
+    today: date | None = None,
+    log=print
+) -> dict:
+    """Create the database at `path` (must not exist), returns row counts."""
+    if path.exists():
+        raise FileExistsError(path)
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    today = today or date.today()
+    capacity = settings.SHIFT_CAPACITY
+
+    horizon_start, horizon_end = horizon_window(today, horizon_weeks)
+    first_day = min(today - timedelta(days=history_days), horizon_start)
+    days = [first_day + timedelta(days=offset) for offset in range((horizon_end - first_day).days + 1)]
+
+    doctors = doctors or _default_doctors(appointments, len(days), days_per_week)
+    patients = patients or max(100, appointments // visits_per_patient)
+    departments = min(departments, doctors)
+
+    password_hash = hash_password(password)
+    doctor_ids = [f"DR{i:06d}" for i in range(doctors)]
+    patient_ids = [f"P{i:07d}" for i in range(patients)]
+    department_ids = [f"DEP{i:03d}" for i in range(departments)]
+
+    # weekly pattern: weekday -> (morning, evening)
+    schedules = []
+    for _ in doctor_ids:
+        workdays = rng.sample(range(7), days_per_week)
+        schedules.append({
+            weekday: rng.choices(SHIFT_PATTERNS, weights=SHIFT_PATTERN_WEIGHTS)[0]
+            for weekday in workdays
+        })
+
+    popularity_rank = list(range(doctors))
+    rng.shuffle(popularity_rank)
+    popularity = [1 / (rank + 1) ** skew for rank in popularity_rank]
+
+    # bookable (doctor, day, shift) slots
+    slots = []
+    weights = []
+    for doctor, schedule in enumerate(schedules):
+        for day_index, day in enumerate(days):
+            pattern = schedule.get(day.weekday())
+            if not pattern:
+                continue
+            weight = popularity[doctor] * (FUTURE_BOOKING_WEIGHT if day >= today else 1)
+            for shift, works in zip(("Morning", "Evening"), pattern):
+                if works:
+                    slots.append((doctor, day_index, shift))
+                    weights.append(weight)
+
+    counts = _fill_slots(rng, weights, appointments, capacity)
+
+    appointment_rows = []
+    treatment_rows = []
+    booked = {}
+    past_statuses = ["complete", "Missed", "cancel", "Booked"]
+    # upper bounds of complete / Missed / cancel, the rest stays Booked
+    past_thresholds = list(itertools.accumulate(
+        [1 - no_show_rate - cancel_rate - pending_rate, no_show_rate, cancel_rate]
+    ))
+    patient_range = range(patients)
+
+    for (doctor, day_index, shift), count in zip(slots, counts):
+        if not count:
+            continue
+
+        day = days[day_index]
+        day_iso = day.isoformat()
+        doctor_id = doctor_ids[doctor]
+        future = day >= today
+        slot_booked = 0
+
+        for patient in rng.sample(patient_range, count):
+            if future:
+                status = "cancel" if rng.random() < cancel_rate else "Booked"
+            else:
+                status = past_statuses[bisect.bisect(past_thresholds, rng.random())]
+
+            appointment_id = f"G{len(appointment_rows):015d}"
+            appointment_rows.append((
+                appointment_id, patient_ids[patient], doctor_id,
+                rng.choice(VISIT_TYPES), day_iso, shift, status, "Routine check"
+            ))
+
+            if status == "Booked":
+                slot_booked += 1
+            elif status == "complete":
+                follow_up = (day + timedelta(days=rng.choice((7, 14, 30)))).isoformat() if rng.random() < 0.3 else None
+                treatment_rows.append((
+                    f"T{appointment_id}", appointment_id, rng.choice(TESTS),
+                    rng.choice(DIAGNOSES), rng.choice(PRESCRIPTIONS), follow_up
+                ))
+
+        if slot_booked:
+            booked[(doctor, day_index, shift)] = slot_booked
+
+    availability_rows = []
+    horizon_offset = (horizon_start - first_day).days
+    for doctor, schedule in enumerate(schedules):
+        for day_index in range(horizon_offset, len(days)):
+            morning, evening = schedule.get(days[day_index].weekday(), (False, False))
+            availability_rows.append((
+                doctor_ids[doctor], days[day_index].isoformat(), morning, evening,
+                capacity - booked.get((doctor, day_index, "Morning"), 0),
+                capacity - booked.get((doctor, day_index, "Evening"), 0),
+            ))
+
+    log(f"generated {len(appointment_rows)} appointments in {time.perf_counter() - started:.1f}s")
+
+    engine = create_engine(f"sqlite:///{Path(path).as_posix()}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=OFF")
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        conn.exec_driver_sql("PRAGMA cache_size=-262144")
+        # sort with helper threads while building the indexes
+        conn.exec_driver_sql("PRAGMA threads=4")
+
+        # the real schema on the empty tables, then its triggers (booking
+        # slots, search index sync) and indexes are set aside for the load
+        init_schema(conn)
+        deferred = conn.exec_driver_sql(
+            "SELECT type, name, sql FROM sqlite_master "
+            "WHERE type IN ('trigger', 'index') AND sql IS NOT NULL"
+        ).all()
+        for kind, name, _sql in deferred:
+            conn.exec_driver_sql(f"DROP {kind.upper()} {name}")
+
+        _insert(conn, "department", ("department_id", "department_name", "head_of_department", "location", "description"), [
+            (department_id, f"Department {i}", doctor_ids[i], f"Block {i % 8}", f"Department {i} of the hospital")
+            for i, department_id in enumerate(department_ids)
+        ])
+        _insert(conn, "doctor", (
+            "doctor_id", "doctor_name", "email", "password_hash", "gender", "qualification",
+            "experience", "special_experience", "speciality", "phone_no", "department_id", "status"
+        ), [
+            (
+                doctor_id, f"Doctor {i}", f"doctor{i}@example.com", password_hash,
+                rng.choice(("Male", "Female")), "MBBS, MD", (experience := rng.randrange(1, 35)),
+                rng.randrange(0, experience + 1), "General medicine", 9000000000 + i,
+                department_ids[i % departments], True
+            ) for i, doctor_id in enumerate(doctor_ids)
+        ])
+        _insert(conn, "patient", (
+            "patient_id", "patient_name", "email", "password_hash", "gender", "phone_no",
+            "emergency_contact", "date_of_birth", "address", "status", "medical_history"
+        ), [
+            (
+                patient_id, f"Patient {i}", f"patient{i}@example.com", password_hash,
+                rng.choice(("Male", "Female")), f"8{i:09d}", f"7{i:09d}",
+                (today - timedelta(days=rng.randrange(18 * 366, 90 * 365))).isoformat(),
+                f"{i} Main street", True, None
+            ) for i, patient_id in enumerate(patient_ids)
+        ])
+        _insert(conn, "doctor_availability", (
+            "doctor_id", "date", "morning_available", "evening_available", "morning_slots", "evening_slots"
+        ), availability_rows)
+        _insert(conn, "appointment", (
+            "appointment_id", "patient_id", "doctor_id", "visit_type", "date", "shift", "status", "reason"
+        ), appointment_rows)
+        _insert(conn, "treatment", (
+            "treatment_id", "appointment_id", "test_done", "diagonsis", "prescription", "follow_up_date"
+        ), treatment_rows)
+
+        log(f"loaded rows in {time.perf_counter() - started:.1f}s")
+
+        for _kind, _name, sql in deferred:
+            conn.exec_driver_sql(sql)
+        rebuild_search_index(conn)
+        # sampled statistics, close enough for the planner
+        conn.exec_driver_sql("PRAGMA analysis_limit=1000")
+        conn.exec_driver_sql("ANALYZE")
+
+    engine.dispose()
+    log(f"indexes, triggers and search index built in {time.perf_counter() - started:.1f}s")
+
+    return {
+        "departments": departments,
+        "doctors": doctors,
+        "patients": patients,
+        "doctor_availability": len(availability_rows),
+        "appointments": len(appointment_rows),
+        "treatments": len(treatment_rows),
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", type=Path, required=True, help="SQLite file to create")
+    parser.add_argument("--force", action="store_true", help="replace an existing file")
+    parser.add_argument("--appointments", type=int, default=100_000)
+    parser.add_argument("--doctors", type=int, help="default: enough for ~50%% of the shift capacity")
+    parser.add_argument("--patients", type=int, help="default: appointments / --visits-per-patient")
+    parser.add_argument("--departments", type=int, default=10)
+    parser.add_argument("--history-days", type=int, default=365)
+    parser.add_argument("--horizon-weeks", type=int, default=settings.AVAILABILITY_HORIZON_WEEKS)
+    parser.add_argument("--days-per-week", type=int, default=5, choices=range(1, 8))
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of doctor popularity")
+    parser.add_argument("--no-show-rate", type=float, default=0.08)
+    parser.add_argument("--cancel-rate", type=float, default=0.1)
+    parser.add_argument("--pending-rate", type=float, default=0.02, help="past appointments still Booked")
+    parser.add_argument("--visits-per-patient", type=int, default=8)
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.no_show_rate + args.cancel_rate + args.pending_rate > 1:
+        parser.error("--no-show-rate, --cancel-rate and --pending-rate add up to more than 1")
+
+    if args.force:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            Path(f"{args.database}{suffix}").unlink(missing_ok=True)
+
+    counts = generate(
+        args.database,
+        appointments=args.appointments,
+        doctors=args.doctors,
+        patients=args.patients,
+        departments=args.departments,
+        history_days=args.history_days,
+        horizon_weeks=args.horizon_weeks,
+        days_per_week=args.days_per_week,
+        skew=args.skew,
+        no_show_rate=args.no_show_rate,
+        cancel_rate=args.cancel_rate,
+        pending_rate=args.pending_rate,
+        visits_per_patient=args.visits_per_patient,
+        password=args.password,
+        seed=args.seed
+    )
+    for table, count in counts.items():
+        print(f"{table:<22}{count:>12}")
+
+
+if __name__ == "__main__":
+    main()
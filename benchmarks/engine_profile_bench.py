@@ -0,0 +1,192 @@
+"""
+Mixed read/write throughput of the "default" vs "production" engine profile.
+
+    python -m benchmarks.engine_profile_bench --seconds 10 --workers 16 --write-ratio 0.2
+
+Each profile gets its own fresh SQLite file, seeded with the same data, and is
+hammered by `--workers` concurrent tasks that each run either a booking-style
+insert + commit or an appointment lookup by doctor. Inserts that hit an
+existing active booking are counted as conflicts.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="engine_profile_bench_"))
+os.environ.setdefault("SQLALCHEMY_SYNC_DATABASE_URI", f"sqlite:///{(_TMP_DIR / 'app.sqlite3').as_posix()}")
+os.environ.setdefault("SQLALCHEMY_ASYNC_DATABASE_URI", f"sqlite+aiosqlite:///{(_TMP_DIR / 'app.sqlite3').as_posix()}")
+os.environ.setdefault("DB_ECHO", "false")
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.base import Base
+from app.database.model import Appointment, Department, Doctor, Patient
+from app.database.session import apply_engine_profile
+
+
+DOCTORS = 50
+PATIENTS = 2000
+SEED_APPOINTMENTS = 20000
+
+
+def _seed(db_path: Path):
+    engine = create_engine(f"sqlite:///{db_path.as_posix()}")
+    Base.metadata.create_all(engine)
+
+    rng = random.Random(42)
+    today = date.today()
+
+    with engine.begin() as conn:
+        conn.execute(insert(Department), [{
+            "department_id": "GEN",
+            "department_name": "General",
+            "location": "B1",
+        }])
+        conn.execute(insert(Doctor), [{
+            "doctor_id": f"DR{i:04d}",
+            "doctor_name": f"Doctor {i}",
+            "email": f"dr{i}@bench.local",
+            "password_hash": "x",
+            "gender": "F",
+            "qualification": "MBBS",
+            "experience": 5,
+            "special_experience": 2,
+            "speciality": "General",
+            "phone_no": 9000000000 + i,
+            "department_id": "GEN",
+            "status": True,
+        } for i in range(DOCTORS)])
+        conn.execute(insert(Patient), [{
+            "patient_id": f"P{i:06d}",
+            "patient_name": f"Patient {i}",
+            "email": f"p{i}@bench.local",
+            "password_hash": "x",
+            "gender": "M",
+            "phone_no": f"8{i:09d}",
+            "date_of_birth": date(1980, 1, 1),
+            "address": "Bench street",
+            "status": True,
+        } for i in range(PATIENTS)])
+        # uq_appointment_active_booking: one active booking per patient, doctor, day and shift
+        bookings = set()
+        while len(bookings) < SEED_APPOINTMENTS:
+            bookings.add((
+                f"P{rng.randrange(PATIENTS):06d}",
+                f"DR{rng.randrange(DOCTORS):04d}",
+                today + timedelta(days=rng.randrange(-30, 30)),
+                rng.choice(("Morning", "Evening")),
+            ))
+
+        conn.execute(insert(Appointment), [{
+            "appointment_id": uuid.uuid4().hex,
+            "patient_id": patient_id,
+            "doctor_id": doctor_id,
+            "visit_type": "OPD",
+            "date": day,
+            "shift": shift,
+            "status": "Booked",
+        } for patient_id, doctor_id, day, shift in sorted(bookings)])
+
+    engine.dispose()
+
+
+async def _run_profile(profile: str, seconds: float, workers: int, write_ratio: float) -> dict:
+    db_path = _TMP_DIR / f"{profile}.sqlite3"
+    _seed(db_path)
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path.as_posix()}",
+        pool_size=workers,
+        max_overflow=0,
+    )
+    apply_engine_profile(engine.sync_engine, profile)
+    Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    counts = {"reads": 0, "writes": 0, "locked": 0, "conflicts": 0}
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+    today = date.today()
+
+    async def worker(seed: int):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            async with Session() as db:
+                try:
+                    if rng.random() < write_ratio:
+                        db.add(Appointment(
+                            appointment_id=uuid.uuid4().hex,
+                            patient_id=f"P{rng.randrange(PATIENTS):06d}",
+                            doctor_id=f"DR{rng.randrange(DOCTORS):04d}",
+                            visit_type="OPD",
+                            date=today + timedelta(days=rng.randrange(0, 30)),
+                            shift=rng.choice(("Morning", "Evening")),
+                            status="Booked",
+                        ))
+                        await db.commit()
+                        counts["writes"] += 1
+                    else:
+                        result = await db.execute(
+                            select(Appointment).where(
+                                Appointment.doctor_id == f"DR{rng.randrange(DOCTORS):04d}"
+                            )
+                        )
+                        result.scalars().all()
+                        counts["reads"] += 1
+                except OperationalError:
+                    await db.rollback()
+                    counts["locked"] += 1
+                    continue
+                except IntegrityError:
+                    # random booking hit an existing active one
+                    await db.rollback()
+                    counts["conflicts"] += 1
+                    continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(workers)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    latencies.sort()
+    ops = counts["reads"] + counts["writes"]
+    return {
+        "profile": profile,
+        "ops_per_sec": ops / elapsed,
+        "reads": counts["reads"],
+        "writes": counts["writes"],
+        "locked_errors": counts["locked"],
+        "conflicts": counts["conflicts"],
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12}{'ops/s':>10}{'reads':>10}{'writes':>10}{'locked':>10}{'conflicts':>11}{'p50 ms':>10}{'p99 ms':>10}")
+    for profile in ("default", "production"):
+        r = await _run_profile(profile, args.seconds, args.workers, args.write_ratio)
+        print(
+            f"{r['profile']:<12}{r['ops_per_sec']:>10.1f}{r['reads']:>10}{r['writes']:>10}"
+            f"{r['locked_errors']:>10}{r['conflicts']:>11}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Cost of turning a list endpoint's service output into a response body.
+
+    python -m benchmarks.serialization_bench --rows 10000 --repeat 20
+
+Compares, per page model:
+
+* fastapi      - what a route returning a dict costs: `response_model`
+                 validation + serialization (FastAPI's own `serialize_response`)
+                 and the stdlib JSON encoder of `JSONResponse`
+* validated    - `trusted_response` with RESPONSE_VALIDATION on: cached
+                 TypeAdapter validation + pydantic-core `dump_json`
+* trusted      - `trusted_response` default: orjson only, no revalidation
+
+No database is involved, the payloads are built in memory.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.config import settings
+from app.core.responses import trusted_response
+from app.database.api_models.appointment_treatment_model import AppointmentResponse
+from app.database.api_models.doctor_model import DoctorSummary
+from app.database.api_models.pagination_model import Page
+from app.database.api_models.patient_model import PatientSummary
+
+
+def _appointments(rows: int) -> dict:
+    today = date.today()
+    return {
+        "items": [{
+            "appointment_id": f"A{i:012d}",
+            "doctor_id": f"DR{i % 50:04d}",
+            "patient_id": f"P{i:06d}",
+            "visit_type": "OPD",
+            "date": today + timedelta(days=i % 30),
+            "status": "Booked",
+            "shift": "Morning" if i % 2 else "Evening",
+        } for i in range(rows)],
+        "next_cursor": "eyJhIjoxfQ",
+        "approximate_total": rows,
+    }
+
+
+def _patients(rows: int) -> dict:
+    return {
+        "items": [{
+            "patient_id": f"P{i:06d}",
+            "patient_name": f"Patient {i}",
+            "email": f"patient{i}@example.com",
+            "phone_no": f"8{i:09d}",
+            "emergency_contact": f"7{i:09d}",
+        } for i in range(rows)],
+        "next_cursor": None,
+        "approximate_total": None,
+    }
+
+
+def _doctors(rows: int) -> dict:
+    return {
+        "items": [{
+            "doctor_id": f"DR{i:06d}",
+            "doctor_name": f"Doctor {i}",
+            "department_name": "General",
+            "phone_no": str(9000000000 + i),
+        } for i in range(rows)],
+        "next_cursor": None,
+        "approximate_total": None,
+    }
+
+
+CASES = [
+    ("appointments", Page[AppointmentResponse], _appointments),
+    ("patients", Page[PatientSummary], _patients),
+    ("doctors", Page[DoctorSummary], _doctors),
+]
+
+
+async def _fastapi_body(field, payload) -> bytes:
+    content = await serialize_response(field=field, response_content=payload, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+def _trusted_body(model, payload, validate: bool) -> bytes:
+    settings.RESPONSE_VALIDATION = validate
+    return trusted_response(payload, model).body
+
+
+def _timed(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+
+    print(f"{'page':<14}{'path':<12}{'median ms':>12}{'p95 ms':>10}{'speedup':>10}")
+    for name, model, build in CASES:
+        payload = build(args.rows)
+        field = create_model_field(name="Response_bench", type_=model, mode="serialization")
+
+        paths = {
+            "fastapi": lambda: loop.run_until_complete(_fastapi_body(field, payload)),
+            "validated": lambda: _trusted_body(model, payload, validate=True),
+            "trusted": lambda: _trusted_body(model, payload, validate=False),
+        }
+
+        baseline = None
+        for path, func in paths.items():
+            func()  # warm up, builds the cached TypeAdapter
+            samples = sorted(_timed(func, args.repeat))
+            median = statistics.median(samples)
+            p95 = samples[int(0.95 * (len(samples) - 1))]
+            baseline = baseline or median
+            print(f"{name:<14}{path:<12}{median:>12.2f}{p95:>10.2f}{baseline / median:>9.1f}x")
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
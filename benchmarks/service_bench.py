@@ -0,0 +1,352 @@
+"""
+Service layer timings against seeded SQLite databases, with a regression gate.
+
+    python -m benchmarks.service_bench --sizes 1000,100000,1000000 --repeat 5 \\
+        --results bench_results.json --baseline benchmarks/baseline.json
+
+Drives the services and scheduler tasks directly (no HTTP), each on its own
+session from the application's sessionmakers (reads on the read-only pool
+like the GET routes), so the configured engine profile applies. Every
+dataset size is generated once a day by `benchmarks.dataset` into a
+template database under `--data-dir` and reused by later runs. Cases that
+write are run on a fresh copy of the template for every sample, the copy
+is not timed.
+
+The timings (median / p95 / min in ms per size and case) are written to
+`--results`. With `--baseline` every median is compared to the baseline's
+and the run exits with status 1 when one is slower by more than
+`--threshold` (and by at least `--min-delta-ms`, to ignore noise on very
+fast cases). A missing baseline file is an error, `--update-baseline`
+stores this run as the new baseline instead of comparing.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+_WORK_DIR = Path(tempfile.mkdtemp(prefix="service_bench_"))
+_WORK_DB = _WORK_DIR / "work.sqlite3"
+os.environ.setdefault("SQLALCHEMY_SYNC_DATABASE_URI", f"sqlite:///{_WORK_DB.as_posix()}")
+os.environ.setdefault("SQLALCHEMY_ASYNC_DATABASE_URI", f"sqlite+aiosqlite:///{_WORK_DB.as_posix()}")
+os.environ.setdefault("DB_ECHO", "false")
+# time the database work, not repeated cache hits
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.database.migrations import LATEST_VERSION
+from app.database.session import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    async_engine,
+    read_async_engine
+)
+from app.database.api_models.appointment_treatment_model import (
+    AppointmentBase,
+    AppointmentBulkCreate
+)
+from app.database.api_models.doctor_availability_model import DoctorAvailabilityBulkUpdate
+from app.scheduler.tasks import Task
+from app.service.admin_service import AdminService
+from app.service.appointment_service import AppointmentService
+from app.service.doctor_availabiliry_service import DoctorAvailabilityService
+from app.service.treatment_service import TreatmentService
+
+from benchmarks.dataset import generate
+
+
+SEED = 42
+
+
+def _template_path(data_dir: Path, appointments: int) -> Path:
+    # the dataset is laid out around today, one template per day
+    return data_dir / f"appointments_{appointments}_v{LATEST_VERSION}_s{SEED}_{date.today().isoformat()}.sqlite3"
+
+
+def _probe(path: Path) -> dict:
+    """Deterministic inputs for the cases, picked from the seeded data."""
+    today = date.today()
+    connection = sqlite3.connect(path)
+    try:
+        def one(sql, *params):
+            return connection.execute(sql, params).fetchone()
+
+        appointment_id, = one("SELECT appointment_id FROM appointment ORDER BY appointment_id LIMIT 1")
+        history_patient, = one(
+            "SELECT patient_id FROM appointment WHERE status = 'complete' "
+            "GROUP BY patient_id ORDER BY COUNT(*) DESC, patient_id LIMIT 1"
+        )
+        doctor_id, booking_date = one(
+            "SELECT doctor_id, date FROM doctor_availability "
+            "WHERE date > ? AND morning_available AND morning_slots > 0 ORDER BY date, doctor_id LIMIT 1",
+            (today + timedelta(days=7)).isoformat()
+        )
+        free_patient, = one(
+            "SELECT patient_id FROM patient WHERE patient_id NOT IN ("
+            "SELECT patient_id FROM appointment WHERE doctor_id = ? AND date = ? AND shift = 'Morning'"
+            ") ORDER BY patient_id LIMIT 1",
+            doctor_id, booking_date
+        )
+        booked = one(
+            "SELECT patient_id, doctor_id, date, shift FROM appointment "
+            "WHERE status = 'Booked' AND date >= ? ORDER BY appointment_id LIMIT 1",
+            today.isoformat()
+        )
+        doctor_ids = [row[0] for row in connection.execute("SELECT doctor_id FROM doctor ORDER BY doctor_id")]
+        patient_ids = [row[0] for row in connection.execute("SELECT patient_id FROM patient ORDER BY patient_id LIMIT 1000")]
+    finally:
+        connection.close()
+
+    return {
+        "appointment_id": appointment_id,
+        "history_patient": history_patient,
+        "doctor_id": doctor_id,
+        "booking_date": date.fromisoformat(booking_date),
+        "free_patient": free_patient,
+        "booked": booked,
+        "doctor_ids": doctor_ids,
+        "patient_ids": patient_ids,
+    }
+
+
+# cases: (name, writes, factory(probe) -> async callable)
+
+def _session_call(service_cls, method: str, *args, **kwargs):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            return await getattr(service_cls(db), method)(*args, **kwargs)
+    return run
+
+
+def _read_call(service_cls, method: str, *args, **kwargs):
+    """On the read-only pool, like the GET routes."""
+    async def run():
+        async with AsyncReadSessionLocal() as db:
+            return await getattr(service_cls(db), method)(*args, **kwargs)
+    return run
+
+
+def _bulk_booking(probe: dict):
+    rng = random.Random(SEED)
+    payload = AppointmentBulkCreate(appointments=[{
+        "patient_id": rng.choice(probe["patient_ids"]),
+        "doctor_id": rng.choice(probe["doctor_ids"]),
+        "visit_type": "OPD",
+        "date": probe["booking_date"] + timedelta(days=rng.randrange(7)),
+        "shift": rng.choice(("Morning", "Evening")),
+    } for _ in range(50)])
+    return _session_call(AppointmentService, "create_appointments_bulk_", payload)
+
+
+def _bulk_availability(probe: dict):
+    payload = DoctorAvailabilityBulkUpdate(changes=[{
+        "doctor_id": doctor_id,
+        "date": probe["booking_date"] + timedelta(days=offset),
+        "morning_available": False,
+        "evening_available": True,
+    } for doctor_id in probe["doctor_ids"][:10] for offset in range(7)])
+    return _session_call(DoctorAvailabilityService, "update_availability_bulk", payload)
+
+
+def _update_status(probe: dict):
+    patient_id, doctor_id, day, shift = probe["booked"]
+    return _session_call(AppointmentService, "update_status_", patient_id, doctor_id, day, shift, "complete")
+
+
+CASES = [
+    ("appointment.get_all_appointment", False,
+        lambda p: _read_call(AppointmentService, "get_all_appointment", limit=100)),
+    ("appointment.get_all_appointment[total]", False,
+        lambda p: _read_call(AppointmentService, "get_all_appointment", limit=100, include_total=True)),
+    ("appointment.get_appointment_by_appointment_id_", False,
+        lambda p: _read_call(AppointmentService, "get_appointment_by_appointment_id_", p["appointment_id"])),
+    ("appointment.create_appointment_", True,
+        lambda p: _session_call(AppointmentService, "create_appointment_", AppointmentBase(
+            patient_id=p["free_patient"], doctor_id=p["doctor_id"], visit_type="OPD",
+            date=p["booking_date"], shift="Morning", status="Booked"
+        ))),
+    ("appointment.create_appointments_bulk_[50]", True, _bulk_booking),
+    ("appointment.update_status_", True, _update_status),
+    ("availability.get_availabilites", False,
+        lambda p: _read_call(DoctorAvailabilityService, "get_availabilites", p["doctor_id"])),
+    ("availability.update_availability_bulk[70]", True, _bulk_availability),
+    ("admin.query_", False,
+        lambda p: _read_call(AdminService, "query_", "Patient 12")),
+    ("treatment.get_patient_history_", False,
+        lambda p: _read_call(TreatmentService, "get_patient_history_", p["history_patient"], limit=50)),
+    ("task.update_appointment_status", True,
+        lambda p: Task.update_appointment_status),
+    ("task.update_availability_dates", True,
+        lambda p: Task.update_availability_dates),
+]
+
+
+# running
+
+async def _restore(template: Path):
+    await async_engine.dispose()
+    await read_async_engine.dispose()
+    for suffix in ("-wal", "-shm", "-journal"):
+        Path(f"{_WORK_DB}{suffix}").unlink(missing_ok=True)
+    shutil.copyfile(template, _WORK_DB)
+
+    # open the pooled connection outside of the timed call
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _run_case(template: Path, writes: bool, func, repeat: int) -> list[float]:
+    samples = []
+    if not writes:
+        await func()  # warm up
+
+    for _ in range(repeat):
+        if writes:
+            await _restore(template)
+        started = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    if writes:
+        await _restore(template)
+    return samples
+
+
+async def run(sizes: list[int], repeat: int, data_dir: Path, only: str | None) -> dict:
+    try:
+        return await _run_sizes(sizes, repeat, data_dir, only)
+    finally:
+        await async_engine.dispose()
+        await read_async_engine.dispose()
+
+
+async def _run_sizes(sizes: list[int], repeat: int, data_dir: Path, only: str | None) -> dict:
+    results = {}
+    for size in sizes:
+        template = _template_path(data_dir, size)
+        if not template.exists():
+            counts = generate(template, appointments=size, seed=SEED, log=lambda line: None)
+            print(f"seeded {size} appointments in {counts['seconds']}s -> {template}", file=sys.stderr)
+
+        probe = _probe(template)
+        await _restore(template)
+
+        results[str(size)] = {}
+        for name, writes, factory in CASES:
+            if only and only not in name:
+                continue
+
+            try:
+                samples = sorted(await _run_case(template, writes, factory(probe), repeat))
+            except Exception as e:
+                # a broken case fails the run but does not hide the other timings
+                results[str(size)][name] = {"error": f"{type(e).__name__}: {e}"}
+                print(f"{size:>9}  {name:<48}{'error':>12}  {type(e).__name__}: {e}")
+                await _restore(template)
+                continue
+
+            timing = {
+                "median_ms": round(statistics.median(samples), 3),
+                "p95_ms": round(samples[math.ceil(0.95 * len(samples)) - 1], 3),
+                "min_ms": round(samples[0], 3),
+                "samples": len(samples),
+            }
+            results[str(size)][name] = timing
+            print(f"{size:>9}  {name:<48}{timing['median_ms']:>12.2f}{timing['p95_ms']:>10.2f}")
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    regressions = []
+    for size, cases in results.items():
+        for name, timing in cases.items():
+            reference = baseline.get(size, {}).get(name)
+            if "error" in timing or not reference or "error" in reference:
+                continue
+
+            before, after = reference["median_ms"], timing["median_ms"]
+            if after > before * (1 + threshold) and after - before >= min_delta_ms:
+                regressions.append(
+                    f"{name} @ {size}: {before:.2f}ms -> {after:.2f}ms (+{(after / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="comma separated appointment counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", type=Path, default=Path(tempfile.gettempdir()) / "service_bench_data")
+    parser.add_argument("--only", help="run the cases whose name contains this string")
+    parser.add_argument("--results", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    # a missing baseline must not silently turn the gate into a pass
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline needs --baseline")
+    if args.baseline and not args.update_baseline and not args.baseline.exists():
+        parser.error(f"baseline {args.baseline} does not exist, create it with --update-baseline")
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    print(f"{'size':>9}  {'case':<48}{'median ms':>12}{'p95 ms':>10}")
+    results = asyncio.run(run(sizes, args.repeat, args.data_dir, args.only))
+
+    report = {
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "db_profile": settings.DB_PROFILE,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    args.results.write_text(json.dumps(report, indent=2))
+    shutil.rmtree(_WORK_DIR, ignore_errors=True)
+
+    failures = [
+        f"{name} @ {size}: {timing['error']}"
+        for size, cases in results.items() for name, timing in cases.items() if "error" in timing
+    ]
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"baseline written to {args.baseline}")
+    elif args.baseline:
+        regressions = compare(
+            results,
+            json.loads(args.baseline.read_text())["results"],
+            args.threshold,
+            args.min_delta_ms
+        )
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        else:
+            print(f"\nno regressions over {args.threshold:.0%} against {args.baseline}")
+        failures += regressions
+
+    for line in failures:
+        print(f"  {line}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,27 @@
-import logging
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import importlib
 
 import uvicorn
 from fastapi import FastAPI 
 
 from contextlib import asynccontextmanager
 
-from app.database.session import sync_engine, SessionLocal
-from app.database.base import Base 
-from app.database.model import Admin
+from app.database.session import sync_engine
+from app.database.bootstrap import (
+    init_schema,
+    init_schema_async,
+    ensure_super_admin
+)
 from app.core.config import settings
-
-from sqlalchemy.orm import Session
-
-from app.scheduler.scheduler_manager import start_scheduler,  scheduler
+from app.core.security import shutdown_password_executor
+from app.core.startup import StartupProfiler
+from app.core.log_config import setup_logging
+from app.core.responses import ORJSONResponse
+from app.core.metrics import MetricsMiddleware, flush_periodically, write_snapshot
+from app.database.query_stats import QueryStatsMiddleware
 
 # from app.api.doctor_route import admin_doctor_api_route
 # from app.api.department_route import admin_department_api_route
@@ -24,11 +33,20 @@ from app.scheduler.scheduler_manager import start_scheduler,  scheduler
 from app import api
 
 
-logging.basicConfig(
-    filename=settings.LOG_FILE,
-    format=settings.LOG_FORMAT,
-    level=logging.DEBUG if settings.DEBUG else logging.INFO
-)
+setup_logging()
+
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+
+async def start_scheduler_():
+    # APScheduler is not needed to serve requests, import it off the event loop
+    scheduler_manager = await asyncio.to_thread(
+        importlib.import_module, "app.scheduler.scheduler_manager"
+    )
+    scheduler_manager.start_scheduler()
+    print("[STARTUP] Scheduler started")
+    return scheduler_manager
 
 
 @asynccontextmanager
@@ -36,48 +54,70 @@ async def lifespan(app: FastAPI):
     print("--------------------------------------------------------------------")
     print("[STARTUP] Server starting...")
 
-    try:
-        Base.metadata.create_all(bind=sync_engine)
-        print("[STARTUP] Database tables checked/created")
+    profiler = StartupProfiler()
+    profiler.record("imports", _IMPORT_SECONDS)
 
-        db: Session = SessionLocal()
+    # deferred startup work in fast boot mode
+    background: list[asyncio.Task] = []
 
-        if not db.query(Admin).filter(Admin.admin_id == "A1").first():
-            print("[STARTUP] creating default super admin...")
+    metrics_task = asyncio.create_task(flush_periodically())
 
-            super_admin = Admin(
-                admin_id="A1",
-                email="superadmin@hospital.com"
-            )
-            super_admin.set_password("admin123")
-            db.add(super_admin)
-            db.commit()
-            
-            print("[STARTUP] super admin created successfully.")
+    try:
+        with profiler.phase("schema"):
+            if settings.FAST_BOOT:
+                schema_version, skipped = await init_schema_async()
+                if skipped:
+                    print("[STARTUP] Database schema current, reflection skipped")
+            else:
+                with sync_engine.begin() as connection:
+                    schema_version = init_schema(connection)
+                print("[STARTUP] Database tables checked/created")
+
+        print(f"[STARTUP] Database schema at version {schema_version}")
+
+        with profiler.phase("super admin"):
+            if settings.FAST_BOOT:
+                background.append(asyncio.create_task(ensure_super_admin()))
+            elif await ensure_super_admin():
+                print("[STARTUP] super admin created successfully.")
 
     except Exception as e:
         print(f"[STARTUP ERROR]: {e}")
-    finally:
-        db.close()
 
-    start_scheduler()
-    
-    print("[STARTUP] Scheduler started")
+    with profiler.phase("scheduler"):
+        scheduler_task = asyncio.create_task(start_scheduler_())
+        if not settings.FAST_BOOT:
+            await scheduler_task
+
+    if settings.FAST_BOOT:
+        # build the OpenAPI schema now instead of on the first /docs hit
+        background.append(asyncio.create_task(asyncio.to_thread(app.openapi)))
 
     print("[STARTUP] Startup complete.")
+    print(profiler.report())
     print("--------------------------------------")
     
     yield  
 
     print("[SHUTDOWN] Server shutting down...")
-    scheduler.shutdown()
+    for task in background:
+        task.cancel()
+
+    scheduler_manager = await scheduler_task
+    await scheduler_manager.stop_scheduler()
     print("[SHUTDOWN] Scheduler stopped")
 
+    shutdown_password_executor()
+
+    metrics_task.cancel()
+    write_snapshot()
+
 
 app = FastAPI(
     debug=settings.DEBUG,
     title="Hospital Management API",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.include_router(api.admin_doctor_api_route)
@@ -87,6 +127,11 @@ app.include_router(api.admin_dashboard_api)
 app.include_router(api.appointment_api_route)
 app.include_router(api.availability_api)
 app.include_router(api.treatment_api_route)
+app.include_router(api.export_api_route)
+app.include_router(api.metrics_api_route)
+
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=False)
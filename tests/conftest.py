@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+
+# the settings are read on import, point the app at a throwaway database first
+_DB_DIR = Path(tempfile.mkdtemp(prefix="hospital_tests_"))
+os.environ["SQLALCHEMY_SYNC_DATABASE_URI"] = f"sqlite:///{(_DB_DIR / 'test.sqlite3').as_posix()}"
+os.environ["SQLALCHEMY_ASYNC_DATABASE_URI"] = f"sqlite+aiosqlite:///{(_DB_DIR / 'test.sqlite3').as_posix()}"
+os.environ["LOG_FILE"] = (_DB_DIR / "debug.log").as_posix()
+os.environ["SCHEDULER_LEADER_ELECTION"] = "false"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_doctor(client):
+    def make(department_id: str = "TEST") -> str:
+        client.post("/admin/department/add/department", json={
+            "department_id": department_id,
+            "department_name": f"Department {department_id}",
+            "location": "T1",
+            "description": "test department"
+        })
+        response = client.post("/admin/doctor/add", json={
+            "doctor_name": "Dr Test",
+            "gender": "F",
+            "qualification": "MBBS",
+            "experience": 5,
+            "special_experience": 1,
+            "speciality": "general",
+            "phone_no": "5550009999",
+            "department_id": department_id,
+            "status": True
+        })
+        assert response.status_code == 201, response.text
+        return response.json()["doctor_id"]
+
+    return make
+
+
+@pytest.fixture
+def make_patient(client):
+    def make(email: str) -> str:
+        response = client.post("/patient/add", json={
+            "patient_name": "Test Patient",
+            "email": email,
+            "password": "password",
+            "gender": "M",
+            "phone_no": "5550008888",
+            "emergency_contact": "5550007777",
+            "date_of_birth": "1975-03-03T00:00:00",
+            "address": "3 Main St",
+            "status": True
+        })
+        assert response.status_code == 201, response.text
+        return response.json()["patient_id"]
+
+    return make
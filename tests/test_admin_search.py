@@ -0,0 +1,19 @@
+def test_search_returns_patient_without_emergency_contact(client):
+    response = client.post("/patient/add", json={
+        "patient_name": "Bob Nocontact",
+        "email": "bob.nocontact@example.com",
+        "password": "password",
+        "gender": "M",
+        "phone_no": "5550001111",
+        "date_of_birth": "1980-01-01T00:00:00",
+        "address": "1 Main St",
+        "status": True
+    })
+    assert response.status_code == 201, response.text
+    patient_id = response.json()["patient_id"]
+
+    response = client.get("/admin/dashboard/get/Nocontact")
+    assert response.status_code == 200, response.text
+
+    patients = {patient["patient_id"]: patient for patient in response.json()["patients"]}
+    assert patients[patient_id]["emergency_contact"] is None
@@ -0,0 +1,29 @@
+from datetime import date, timedelta
+
+
+def test_rebooking_after_cancel_targets_the_active_row(client, make_doctor, make_patient):
+    doctor_id = make_doctor()
+    patient_id = make_patient("rebook@example.com")
+    day = date.today() + timedelta(days=2)
+    client.put(f"/doctor/availability/{doctor_id}/{day}", json={"morning_available": True, "evening_available": True})
+
+    booking = {"patient_id": patient_id, "doctor_id": doctor_id, "visit_type": "OPD", "date": str(day), "shift": "Morning"}
+    path = f"{patient_id}/{doctor_id}/{day}/Morning"
+
+    first = client.post("/appointment/create", json=booking).json()["appointment_id"]
+    assert client.put(f"/appointment/cancel/{path}").status_code == 200
+    second = client.post("/appointment/create", json=booking).json()["appointment_id"]
+    assert first != second
+
+    response = client.get(f"/appointment/get/{patient_id}/{doctor_id}")
+    assert response.json()["appointment_id"] == second
+
+    # the new booking can be cancelled, then nothing active is left to change
+    assert client.put(f"/appointment/cancel/{path}").status_code == 200
+    assert client.get(f"/appointment/get/{second}").json()["status"] == "cancel"
+    assert client.put(f"/appointment/complete/{path}").status_code == 409
+
+    third = client.post("/appointment/create", json=booking).json()["appointment_id"]
+    response = client.put(f"/appointment/complete/{path}")
+    assert response.status_code == 200, response.text
+    assert client.get(f"/appointment/get/{third}").json()["status"] == "complete"
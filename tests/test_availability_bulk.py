@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from app.database.session import sync_engine
+from app.service import doctor_availabiliry_service
+
+
+def _slots(doctor_id: str, day: date) -> tuple[int, int]:
+    with sync_engine.connect() as connection:
+        return tuple(connection.execute(
+            text("SELECT morning_slots, evening_slots FROM doctor_availability WHERE doctor_id = :doctor_id AND date = :date"),
+            {"doctor_id": doctor_id, "date": str(day)}
+        ).one())
+
+
+def test_bulk_update_keeps_slots_taken_after_its_read(client, make_doctor, monkeypatch):
+    doctor_id = make_doctor()
+    day = date.today() + timedelta(days=3)
+    client.put(f"/doctor/availability/{doctor_id}/{day}", json={"morning_available": True, "evening_available": False})
+    morning, evening = _slots(doctor_id, day)
+
+    real_insert = doctor_availabiliry_service.insert
+
+    def insert_after_a_booking(*args, **kwargs):
+        # a booking takes a morning slot between the bulk read and its write
+        with sync_engine.begin() as connection:
+            connection.execute(
+                text("UPDATE doctor_availability SET morning_slots = morning_slots - 1 WHERE doctor_id = :doctor_id AND date = :date"),
+                {"doctor_id": doctor_id, "date": str(day)}
+            )
+        return real_insert(*args, **kwargs)
+
+    monkeypatch.setattr(doctor_availabiliry_service, "insert", insert_after_a_booking)
+
+    response = client.put("/doctor/availability/bulk", json={"changes": [{
+        "doctor_id": doctor_id,
+        "date": str(day),
+        "morning_available": True,
+        "evening_available": True
+    }]})
+    assert response.status_code == 200, response.text
+
+    assert _slots(doctor_id, day) == (morning - 1, evening)
+    assert list(response.json()["diff"][0]["fields"]) == ["evening_available"]
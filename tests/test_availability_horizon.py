@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.database.session import sync_engine
+from app.service.availability_horizon import horizon_window
+
+
+HORIZON_DAYS = 7 * settings.AVAILABILITY_HORIZON_WEEKS
+
+
+def _create_doctor(client) -> str:
+    client.post("/admin/department/add/department", json={
+        "department_id": "HRZN",
+        "department_name": "Horizon",
+        "location": "C1",
+        "description": "availability horizon tests"
+    })
+    response = client.post("/admin/doctor/add", json={
+        "doctor_name": "Dr Horizon",
+        "gender": "F",
+        "qualification": "MBBS",
+        "experience": 3,
+        "special_experience": 1,
+        "speciality": "general",
+        "phone_no": "5550002222",
+        "department_id": "HRZN",
+        "status": True
+    })
+    assert response.status_code == 201, response.text
+    return response.json()["doctor_id"]
+
+
+def test_horizon_fills_gaps_before_rows_ahead_of_it(client):
+    doctor_id = _create_doctor(client)
+    start, end = horizon_window()
+
+    with sync_engine.begin() as connection:
+        connection.execute(
+            text("DELETE FROM doctor_availability WHERE doctor_id = :doctor_id"),
+            {"doctor_id": doctor_id}
+        )
+
+    response = client.put("/doctor/availability/bulk", json={"changes": [{
+        "doctor_id": doctor_id,
+        "date": str(end + timedelta(days=30)),
+        "morning_available": True,
+        "evening_available": False
+    }]})
+    assert response.status_code == 200, response.text
+
+    response = client.post(f"/doctor/availability/create/{doctor_id}")
+    assert response.status_code == 201, response.text
+    assert response.json()["created"] == HORIZON_DAYS
+
+    # a deleted day inside the window is refilled
+    with sync_engine.begin() as connection:
+        connection.execute(
+            text("DELETE FROM doctor_availability WHERE doctor_id = :doctor_id AND date = :date"),
+            {"doctor_id": doctor_id, "date": str(start + timedelta(days=3))}
+        )
+
+    response = client.post(f"/doctor/availability/create/{doctor_id}")
+    assert response.json()["created"] == 1
+
+    response = client.post(f"/doctor/availability/create/{doctor_id}")
+    assert response.json()["created"] == 0
+
+
+def test_horizon_for_unknown_doctor_is_404(client):
+    response = client.post("/doctor/availability/create/NO-SUCH-DOCTOR")
+    assert response.status_code == 404
@@ -0,0 +1,43 @@
+import sqlite3
+
+import pytest
+
+from app.service.helper import booking_conflict
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(
+        """
+        CREATE TABLE patient (patient_id TEXT PRIMARY KEY);
+        CREATE TABLE appointment (
+            appointment_id TEXT PRIMARY KEY,
+            patient_id TEXT NOT NULL REFERENCES patient (patient_id),
+            doctor_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            shift TEXT NOT NULL,
+            status TEXT NOT NULL
+        );
+        CREATE UNIQUE INDEX uq_appointment_active_booking
+            ON appointment (patient_id, doctor_id, date, shift) WHERE status != 'cancel';
+        INSERT INTO patient VALUES ('P1');
+        INSERT INTO appointment VALUES ('A1', 'P1', 'D1', '2026-01-05', 'Morning', 'Booked');
+        """
+    )
+    yield connection
+    connection.close()
+
+
+@pytest.mark.parametrize("row, conflict", [
+    (("A1", "P1", "D1", "2026-01-06", "Morning", "Booked"), "appointment_id"),
+    (("A2", "P1", "D1", "2026-01-05", "Morning", "Booked"), "duplicate"),
+    (("A3", "P404", "D1", "2026-01-05", "Morning", "Booked"), "not_found"),
+    (("A4", "P1", "D1", "2026-01-05", None, "Booked"), None),
+])
+def test_booking_conflict_classifies_integrity_errors(connection, row, conflict):
+    with pytest.raises(sqlite3.IntegrityError) as error:
+        connection.execute("INSERT INTO appointment VALUES (?, ?, ?, ?, ?, ?)", row)
+
+    assert booking_conflict(error.value) == conflict
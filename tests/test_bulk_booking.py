@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+from app.service import AppointmentService
+
+
+def _create_doctor_and_patient(client, email: str) -> tuple[str, str]:
+    client.post("/admin/department/add/department", json={
+        "department_id": "BULK",
+        "department_name": "Bulk",
+        "location": "D1",
+        "description": "bulk booking tests"
+    })
+    doctor_id = client.post("/admin/doctor/add", json={
+        "doctor_name": "Dr Bulk",
+        "gender": "M",
+        "qualification": "MBBS",
+        "experience": 4,
+        "special_experience": 1,
+        "speciality": "general",
+        "phone_no": "5550003333",
+        "department_id": "BULK",
+        "status": True
+    }).json()["doctor_id"]
+    patient_id = client.post("/patient/add", json={
+        "patient_name": "Bulk Patient",
+        "email": email,
+        "password": "password",
+        "gender": "F",
+        "phone_no": "5550004444",
+        "emergency_contact": "5550005555",
+        "date_of_birth": "1985-05-05T00:00:00",
+        "address": "2 Main St",
+        "status": True
+    }).json()["patient_id"]
+    return doctor_id, patient_id
+
+
+def test_bulk_booking_rejects_unknown_ids_without_row_fallback(client, monkeypatch):
+    async def no_fallback(*args, **kwargs):
+        raise AssertionError("the batch insert fell back to row by row inserts")
+
+    monkeypatch.setattr(AppointmentService, "_insert_one_by_one", no_fallback)
+
+    doctor_id, patient_id = _create_doctor_and_patient(client, "bulk.patient@example.com")
+
+    day = date.today() + timedelta(days=1)
+    client.put(f"/doctor/availability/{doctor_id}/{day}", json={"morning_available": True, "evening_available": True})
+
+    booking = {"visit_type": "OPD", "date": str(day), "shift": "Morning"}
+    response = client.post("/appointment/create/bulk", json={"appointments": [
+        {"patient_id": patient_id, "doctor_id": doctor_id, **booking},
+        {"patient_id": "NO-SUCH-PATIENT", "doctor_id": doctor_id, **booking},
+        {"patient_id": patient_id, "doctor_id": "NO-SUCH-DOCTOR", **booking},
+    ]})
+    assert response.status_code == 200, response.text
+
+    statuses = [result["status"] for result in response.json()["results"]]
+    assert statuses == ["created", "invalid", "invalid"]
+
+
+def test_bulk_booking_bounds_appointment_id_retries(client):
+    # the generated id varies in one hex character per patient, doctor, shift and weekday
+    doctor_id, patient_id = _create_doctor_and_patient(client, "bulk.weekly@example.com")
+    days = [date.today() + timedelta(weeks=week + 1) for week in range(17)]
+
+    response = client.put("/doctor/availability/bulk", json={"changes": [
+        {"doctor_id": doctor_id, "date": str(day), "morning_available": True, "evening_available": False}
+        for day in days
+    ]})
+    assert response.status_code == 200, response.text
+
+    response = client.post("/appointment/create/bulk", json={"appointments": [
+        {"patient_id": patient_id, "doctor_id": doctor_id, "visit_type": "OPD", "date": str(day), "shift": "Morning"}
+        for day in days
+    ]})
+    assert response.status_code == 200, response.text
+
+    body = response.json()
+    assert body["created"] + body["failed"] == 17
+    assert body["created"] <= 16
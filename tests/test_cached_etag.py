@@ -0,0 +1,42 @@
+from sqlalchemy import text
+
+from app.database.session import sync_engine
+
+
+def test_cached_body_follows_a_write_from_another_worker(client, make_doctor):
+    doctor_id = make_doctor("ETAG")
+
+    first = client.get(f"/admin/doctor/get/{doctor_id}")
+    assert first.status_code == 200, first.text
+
+    # another worker's write: data and version change, this process's cache is not invalidated
+    with sync_engine.begin() as connection:
+        connection.execute(
+            text("UPDATE doctor SET doctor_name = 'Dr Renamed' WHERE doctor_id = :doctor_id"),
+            {"doctor_id": doctor_id}
+        )
+        connection.execute(text("UPDATE table_version SET version = version + 1 WHERE table_name = 'doctor'"))
+
+    response = client.get(f"/admin/doctor/get/{doctor_id}", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 200
+    assert response.json()["doctor_name"] == "Dr Renamed"
+    assert response.headers["etag"] != first.headers["etag"]
+
+
+def test_department_delete_changes_availability_etag(client, make_doctor):
+    client.post("/admin/department/add/department", json={
+        "department_id": "ETAGD",
+        "department_name": "Etag delete",
+        "location": "E1"
+    })
+    doctor_id = make_doctor("ETAGD")
+    assert client.post(f"/doctor/availability/create/{doctor_id}").status_code == 201
+
+    first = client.get(f"/doctor/availability/get/{doctor_id}")
+    assert first.status_code == 200, first.text
+
+    assert client.delete("/admin/department/delete/ETAGD").status_code == 200
+
+    response = client.get(f"/doctor/availability/get/{doctor_id}", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code != 304
+    assert response.headers.get("etag") != first.headers["etag"]
@@ -0,0 +1,26 @@
+from app.database.session import sync_engine
+
+
+def _dangling_references() -> list:
+    with sync_engine.connect() as connection:
+        return connection.exec_driver_sql("PRAGMA foreign_key_check").all()
+
+
+def test_deletes_leave_no_dangling_doctor_references(client, make_doctor):
+    head = make_doctor("REFS")
+    other = make_doctor("REFS")
+    client.post("/admin/department/add/department", json={
+        "department_id": "REFS2",
+        "department_name": "Refs two",
+        "location": "T2",
+        "head_of_department": head
+    })
+    assert client.put("/admin/department/update/REFS", json={"head_of_department": other}).status_code == 200
+    assert client.post(f"/doctor/availability/create/{other}").status_code == 201
+
+    assert client.delete(f"/admin/doctor/delete/{other}").status_code == 200
+    assert _dangling_references() == []
+
+    # the department's doctors head another department and have availability days
+    assert client.delete("/admin/department/delete/REFS").status_code == 200
+    assert _dangling_references() == []
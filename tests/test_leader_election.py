@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.database.session import async_engine, sync_engine
+from app.scheduler.leader import LeaderElection
+
+
+def _lease():
+    with sync_engine.connect() as connection:
+        return connection.execute(
+            text("SELECT holder, expires_at FROM scheduler_lease WHERE name = 'leader-test'")
+        ).first()
+
+
+async def _run_for(election: LeaderElection, seconds: float):
+    task = asyncio.create_task(election.run())
+    await asyncio.sleep(seconds)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def test_failed_election_handler_gives_the_lease_up(client):
+    attempts = []
+
+    async def on_elected():
+        attempts.append(1)
+        raise RuntimeError("database is locked")
+
+    async def scenario():
+        try:
+            election = LeaderElection("leader-test", lease_seconds=5, heartbeat_seconds=0.05, on_elected=on_elected)
+            await _run_for(election, 0.3)
+            assert not election.is_leader
+            # the handler is retried on later heartbeats instead of leading paused
+            assert len(attempts) > 1
+            assert _lease().expires_at == 0
+
+            other = LeaderElection("leader-test", lease_seconds=5, heartbeat_seconds=0.05)
+            assert await other._try_acquire()
+        finally:
+            # the engine's connections belong to this event loop
+            await async_engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_failed_job_run_is_not_recorded(client, monkeypatch):
+    from app.scheduler import scheduler_manager, tasks
+
+    async def prune_fails(db, today=None):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(tasks, "prune_past_availability", prune_fails)
+    job = scheduler_manager.leader_job("failing-job", tasks.Task.update_availability_dates)
+
+    async def scenario():
+        try:
+            with pytest.raises(RuntimeError):
+                await job()
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(scenario())
+
+    with sync_engine.connect() as connection:
+        recorded = connection.execute(
+            text("SELECT 1 FROM scheduler_job_run WHERE job_id = 'failing-job'")
+        ).first()
+    assert recorded is None